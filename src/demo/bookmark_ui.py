@@ -2,6 +2,8 @@ import db_interactions
 import discord
 import models
 
+BOOKMARK_COLOUR = discord.Colour(0x68C290)
+
 
 async def send_bookmark(interaction: discord.Interaction, record: models.BookmarkedMessage):
     embed = build_bookmark_embed(record=record)
@@ -27,26 +29,25 @@ class BookmarkForm(discord.ui.Modal):
         """Sends the bookmark embed to the user with the newly chosen title."""
         title = self.bookmark_title.value or self.bookmark_title.default
         await interaction.response.defer(ephemeral=True)
-        record = await db_interactions.add(interaction, self.message, title)
+        record = db_interactions.build_record(interaction, self.message, title)
+        # This only queues the save, so the confirmation isn't held up by the write
+        saved = await db_interactions.add(record)
         await send_bookmark(interaction, record)
+        try:
+            await saved
+        except Exception:
+            await interaction.followup.send(embed=build_error_embed("Your bookmark could not be saved, please try again."), ephemeral=True)
+            raise
 
 
 def build_bookmark_embed(record: models.BookmarkedMessage):
-        embed = discord.Embed(title=record.title, description=record.message_content, colour=0x68C290)
+        embed = discord.Embed(title=record.title, description=record.message_content, url=record.jump_url, colour=BOOKMARK_COLOUR)
         embed.set_author(
             name=record.author_name,
             icon_url=record.author_avatar_url
         )
         return embed
 
-def build_embeds_list(records: list[models.BookmarkedMessage]) -> list[discord.Embed]:
-        embeds: list[discord.Embed] = []
-        for record in records:
-            embed = build_bookmark_embed(record)
-            embeds.append(embed)
-        return embeds
-
-
 def build_error_embed(embed_content: str):
     embed = discord.Embed(title="Error Saving embed", description=embed_content)
     embed.set_author(name="Bookmark Bot")
@@ -57,11 +58,21 @@ class ArrowButtons(discord.ui.View):
     def __init__(self, records: list[models.BookmarkedMessage]) -> None:
         super().__init__(timeout=None)
         self.records = records
-        self.content = build_embeds_list(records)
         self.position = 0
-        self.pages = len(self.content)
+        self.pages = len(self.records)
+        # Embeds for the pages that have been viewed, keyed by page index
+        self._embeds: dict[int, discord.Embed] = {}
         self.on_ready()
 
+    def embed_at(self, index: int) -> discord.Embed:
+        """Builds the embed for a page on demand, so only pages that get viewed are ever built"""
+        embed = self._embeds.get(index)
+        if embed is None:
+            embed = self._embeds[index] = build_bookmark_embed(self.records[index])
+        return embed
+
+    # discord.py replaces each decorated callback on the instance with its button item,
+    # so `self.back` and `self.forward` are the arrow buttons themselves.
     @discord.ui.button(label='⬅️', style=discord.ButtonStyle.primary, custom_id='l_button')
     async def back(self, interaction: discord.Interaction, button: discord.ui.Button) -> None:
         """Controls the left button on the qotd list embed"""
@@ -73,14 +84,14 @@ class ArrowButtons(discord.ui.View):
             button.disabled = True
 
         # set the right button to a variable
-        right_button = [x for x in self.children if x.custom_id == 'r_button'][0]
+        right_button = self.forward
 
         # check if we're not on the last page, if yes then enable right button
         if not self.position == self.pages - 1:
             right_button.disabled = False
 
         # update discord message
-        await interaction.response.edit_message(embed=self.content[self.position], view=self)
+        await interaction.response.edit_message(embed=self.embed_at(self.position), view=self)
 
     @discord.ui.button(label='➡️️️', style=discord.ButtonStyle.primary, custom_id='r_button')
     async def forward(self, interaction: discord.Interaction, button: discord.ui.Button) -> None:
@@ -89,7 +100,7 @@ class ArrowButtons(discord.ui.View):
         self.position += 1
 
         # set a variable for left button
-        left_button = [x for x in self.children if x.custom_id == 'l_button'][0]
+        left_button = self.back
         # check if we're not on the first page, if yes then enable left button
         if not self.position == 0:
             left_button.disabled = False
@@ -99,19 +110,19 @@ class ArrowButtons(discord.ui.View):
             button.disabled = True
 
         # update discord message
-        await interaction.response.edit_message(embed=self.content[self.position], view=self)
+        await interaction.response.edit_message(embed=self.embed_at(self.position), view=self)
 
     @discord.ui.button(label='🗑', style=discord.ButtonStyle.danger, custom_id='del_button')
     async def delete(self, interaction: discord.Interaction, _: discord.ui.Button) -> None:
         """Controls the delete button on the qotd list embed"""
 
         # remove the entry from the database
-        await db_interactions.remove(self.records[self.position]) # This is causing some errors to check in the morning
-        self.records.remove(self.records[self.position])
+        removed = await db_interactions.remove(self.records[self.position])
+        del self.records[self.position]
 
-        # remove the embed from the message
-        self.content.remove(self.content[self.position])
-        self.pages = len(self.content)
+        # indices have shifted, so any cached embeds are stale
+        self._embeds.clear()
+        self.pages = len(self.records)
 
         # Only change position if the deleted item is not the first one
         if self.position == 0:
@@ -120,27 +131,33 @@ class ArrowButtons(discord.ui.View):
             self.position -= 1
 
         # set a variable for left button
-        left_button: discord.Button = [x for x in self.children if x.custom_id == 'l_button'][0]
+        left_button = self.back
         # check if we're not on the first page, if yes then enable left button
         if self.position == 0:
             left_button.disabled = True
 
         # set the right button to a variable
-        right_button: discord.Button = [x for x in self.children if x.custom_id == 'r_button'][0]
+        right_button = self.forward
         # check if we're not on the last page, if yes then enable right button
         if self.position == self.pages - 1:
             right_button.disabled = True
 
         # Edit the message if there is still data. otherwise delete it.
         if self.pages > 0:
-            await interaction.response.edit_message(embed=self.content[self.position], view=self)
+            await interaction.response.edit_message(embed=self.embed_at(self.position), view=self)
         else:
             await interaction.response.edit_message(content="You have no more saved bookmarks", embed=None, view=None)
 
+        try:
+            await removed
+        except Exception:
+            await interaction.followup.send(embed=build_error_embed("Your bookmark could not be removed, please try again."), ephemeral=True)
+            raise
+
     def on_ready(self) -> None:
         """Checks the number of pages to decide which buttons to have enabled/disabled"""
-        left_button = [x for x in self.children if x.custom_id == 'l_button'][0]
-        right_button = [x for x in self.children if x.custom_id == 'r_button'][0]
+        left_button = self.back
+        right_button = self.forward
 
         # if we only have one page, disable both buttons
         if self.pages == 1:
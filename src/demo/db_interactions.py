@@ -1,31 +1,136 @@
+from __future__ import annotations
+
+import asyncio
+
 import discord
 import models
+from aiocache import SimpleMemoryCache
 from demobot_config import default_icon
+from loguru import logger
 
 import discobase
 
+_user_cache = SimpleMemoryCache(ttl=60)
+"""Recently retrieved bookmarks, keyed by user ID. Invalidated on add/remove."""
+_write_versions: dict[int, int] = {}
+"""Number of times each user's bookmarks were invalidated, so `get` can tell if a write raced its lookup."""
+_write_queue: asyncio.Queue[tuple[models.BookmarkedMessage, bool, asyncio.Future[None]]] = asyncio.Queue(maxsize=10_000)
+"""Pending writes as `(record, delete, done)` tuples, drained by the writer task. `done` gets the outcome of the write."""
+
+WRITE_BATCH_SIZE = 100
+"""Maximum number of writes taken off the queue at once."""
+WRITE_DEBOUNCE = 0.05
+"""Seconds to wait for more writes before applying a batch."""
+PENDING_WRITE_TIMEOUT = 5
+"""Maximum number of seconds `get` waits on the user's own queued writes."""
+_pending_writes: dict[int, set[asyncio.Future[None]]] = {}
+"""Queued writes that haven't been applied yet, keyed by user ID."""
+
+
+async def _invalidate(user_id: int) -> None:
+    """Drop a user's cached bookmarks, and make sure a lookup that's still running doesn't cache them again."""
+    _write_versions[user_id] = _write_versions.get(user_id, 0) + 1
+    await _user_cache.delete(user_id)
+
+
+async def _queue_write(record: models.BookmarkedMessage, delete: bool) -> asyncio.Future[None]:
+    """Queue a save or delete for the writer task, and track it as one of the user's pending writes."""
+    done = asyncio.get_running_loop().create_future()
+    pending = _pending_writes.setdefault(record.user_id, set())
+    pending.add(done)
+
+    def _forget(fut: asyncio.Future[None]) -> None:
+        pending.discard(fut)
+        if not pending and _pending_writes.get(record.user_id) is pending:
+            del _pending_writes[record.user_id]
+
+    done.add_done_callback(_forget)
+    await _invalidate(record.user_id)
+    await _write_queue.put((record, delete, done))
+    return done
+
+
+async def _apply(record: models.BookmarkedMessage, delete: bool, done: asyncio.Future[None]) -> None:
+    """Save or delete a single record, and report the outcome through `done`."""
+    try:
+        # Calling these can raise too (e.g. deleting a record that was never saved), so keep them in the try
+        await (record.delete() if delete else record.save())
+    except Exception as e:
+        logger.opt(exception=e).error(f"Failed to {'remove' if delete else 'save'} a bookmark")
+        if not done.done():
+            done.set_exception(e)
+    else:
+        if not done.done():
+            done.set_result(None)
+    finally:
+        await _invalidate(record.user_id)
+
+
+async def _write_loop() -> None:
+    """Apply queued writes in batches for as long as the bot is running."""
+    while True:
+        batch = [await _write_queue.get()]
+        try:
+            # Let a burst of writes pile up so they go out together
+            await asyncio.sleep(WRITE_DEBOUNCE)
+            while len(batch) < WRITE_BATCH_SIZE and not _write_queue.empty():
+                batch.append(_write_queue.get_nowait())
+
+            # discobase updates its index messages with a read-modify-write, so concurrent writes to the
+            # same table can clobber each other. Apply them one at a time, in the order they were queued.
+            for record, delete, done in batch:
+                await _apply(record, delete, done)
+        except Exception as e:
+            logger.opt(exception=e).error("Bookmark writer failed to apply a batch")
+            for _, _, done in batch:
+                if not done.done():
+                    done.set_exception(e)
+        finally:
+            for _ in batch:
+                _write_queue.task_done()
 
-async def add(interaction: discord.Interaction, message: discord.Message, title: str) -> models.BookmarkedMessage:
-    """Add a message to the bookmarks.
+
+def start_writer() -> asyncio.Task[None]:
+    """Start the background task that applies queued writes. The caller needs to keep a reference to it.
+
+    Returns:
+        asyncio.Task[None]: the writer task
+    """
+    return asyncio.create_task(_write_loop())
+
+
+def build_record(interaction: discord.Interaction, message: discord.Message, title: str) -> models.BookmarkedMessage:
+    """Build the bookmark record for a message, without saving it.
 
     Args:
         interaction: The `discord.Interaction` that initiated the command
         message: The `discord.Message` that is being bookmarked
         title: The title provided by the modal
     Returns:
-        models.BookmarkedMessage: the record that was saved to the database
+        models.BookmarkedMessage: the unsaved record
     """
 
     avatar_url = message.author.display_avatar.url if message.author.display_avatar is not None else default_icon
-    record = models.BookmarkedMessage(
+    return models.BookmarkedMessage(
         user_id=interaction.user.id,
         title=title,
         author_name=message.author.name,
         author_avatar_url=avatar_url,
-        message_content=message.content
+        message_content=message.content,
+        guild_id=message.guild.id if message.guild is not None else 0,
+        channel_id=message.channel.id,
+        message_id=message.id
     )
-    await record.save()
-    return record
+
+async def add(record: models.BookmarkedMessage) -> asyncio.Future[None]:
+    """Add a message to the bookmarks. This only queues the save, the writer task does the actual write.
+
+    Args:
+        record: The record built by `build_record`
+    Returns:
+        asyncio.Future[None]: resolves once the record is saved, or holds the error if saving failed
+    """
+    return await _queue_write(record, delete=False)
 
 async def get(db: discobase.Database, interaction: discord.Interaction) -> list[models.BookmarkedMessage]:
     """Get bookmarks for a user, or across the whole server. If getting bookmarks for the whole sever, a search string is required.
@@ -37,13 +142,29 @@ async def get(db: discobase.Database, interaction: discord.Interaction) -> list[
     Returns:
         list[models.BookmarkedMessage]: the list of bookmarks saved by the user
     """
-    return await db.tables[models.BookmarkedMessage.__name__.lower()].find(user_id = interaction.user.id)
+    # Don't hand out bookmarks that are about to be added or deleted. Only this user's writes matter, and if
+    # the writer is stuck, the version check below still keeps whatever we read out of the cache.
+    pending = _pending_writes.get(interaction.user.id)
+    if pending:
+        await asyncio.wait(set(pending), timeout=PENDING_WRITE_TIMEOUT)
 
-async def remove(record: models.BookmarkedMessage) -> None:
-    """Remove a bookmark from the list.
+    records = await _user_cache.get(interaction.user.id)
+    if records is None:
+        version = _write_versions.get(interaction.user.id, 0)
+        records = await db.tables[models.BookmarkedMessage.__name__.lower()].find(user_id = interaction.user.id)
+        # If a write came in while we were looking, these might already be stale
+        if _write_versions.get(interaction.user.id, 0) == version:
+            await _user_cache.set(interaction.user.id, records)
+
+    # Views mutate the list they're given, so hand out a copy
+    return list(records)
+
+async def remove(record: models.BookmarkedMessage) -> asyncio.Future[None]:
+    """Remove a bookmark from the list. This only queues the deletion, the writer task does the actual write.
 
     Args:
-        db: discobase database instance.
         record: the record to delete
+    Returns:
+        asyncio.Future[None]: resolves once the record is deleted, or holds the error if deleting failed
     """
-    await record.delete()
+    return await _queue_write(record, delete=True)
@@ -2,15 +2,13 @@ import bookmark_ui
 import db_interactions
 import discord
 from demobot_config import db
-from discord.ext import commands
 
 
 class Bookmark(discord.app_commands.Group):
-    def __init__(self, bot: commands.Bot):
+    def __init__(self):
         super().__init__(name="bookmark")
-        self.bot = bot
+        # Context menus can't live inside a group, so the bot registers this alongside it
         self.bookmark_context_menu = discord.app_commands.ContextMenu(name="Bookmark", callback=self.bookmark_message_callback)
-        self.bot.tree.add_command(self.bookmark_context_menu)
 
     async def bookmark_message_callback(self, interaction: discord.Interaction, message: discord.Message) -> None:
         """
@@ -37,4 +35,8 @@ class Bookmark(discord.app_commands.Group):
             await interaction.followup.send("You have not bookmarked any messages")
         else:
             buttons = bookmark_ui.ArrowButtons(records=records)
-            await interaction.followup.send(view=buttons, embed=buttons.content[0], ephemeral=True)
+            await interaction.followup.send(view=buttons, embed=buttons.embed_at(0), ephemeral=True)
+
+
+BOOKMARK_CMD = Bookmark()
+"""The bookmark command group. Built once at import, so each bot instance reuses it."""
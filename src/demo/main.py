@@ -1,43 +1,115 @@
 from __future__ import annotations
 
 import asyncio
+import hashlib
+import json
+import logging
 import os
+import sys
+from pathlib import Path
 
+import db_interactions
 import demobot_commands
 import discord
 from demobot_config import db
 from loguru import logger
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+# Fail fast at startup instead of passing None down to discord.py
+DB_TOKEN = os.environ["DB_BOT_TOKEN"]
+BOT_TOKEN = os.environ["BOOKMARK_BOT_TOKEN"]
+DEBUG = bool(os.getenv("DEBUG"))
+"""Development mode, enables asyncio's debug checks."""
+
+# Hand log records to a writer thread, so emitting a log never blocks the event loop on stderr
+logger.remove()
+logger.add(sys.stderr, level="DEBUG" if DEBUG else "INFO", enqueue=True, backtrace=False, diagnose=False)
+
+COMMAND_HASH_PATH = Path.home() / ".cache" / "discobase" / "cmdhash"
+"""Where the hash of the last synced command payload is stored."""
+
 
 class BookmarkBot(discord.Client):
     def __init__(self):
-        super().__init__(intents=discord.Intents.all(), command_prefix="!")
+        # Bookmarking only needs guilds and messages, everything else is gateway traffic we'd ignore
+        intents = discord.Intents(guilds=True, messages=True, message_content=True)
+        super().__init__(
+            intents=intents,
+            command_prefix="!",
+            member_cache_flags=discord.MemberCacheFlags.none(),
+            chunk_guilds_at_startup=False,
+            # Bookmarked messages come in with the interaction, so the message cache is never read
+            max_messages=None,
+        )
         self.tree = discord.app_commands.CommandTree(self)
-        self.tree.add_command(demobot_commands.Bookmark(self))
+        self.tree.add_command(demobot_commands.BOOKMARK_CMD)
+        self.tree.add_command(demobot_commands.BOOKMARK_CMD.bookmark_context_menu)
+        self._writer_task: asyncio.Task[None] | None = None
+        self._synced = False
+
+    async def setup_hook(self) -> None:
+        # Keep a strong reference, the writer runs for the bot's whole lifetime
+        self._writer_task = db_interactions.start_writer()
+
+    def _command_hash(self) -> str:
+        """Hashes the payload that `tree.sync()` would send, so unchanged commands can skip the sync."""
+        payload = {
+            "application_id": self.application_id,
+            "commands": [command.to_dict(self.tree) for command in self.tree.get_commands()],
+        }
+        return hashlib.blake2b(json.dumps(payload, sort_keys=True).encode("utf-8"), digest_size=16).hexdigest()
 
     @logger.catch(reraise=True)
     async def on_ready(self) -> None:
-        try:
-            await self.tree.sync()
-            logger.info(f"Logged in as {self.user}")
-            logger.debug(f"{self.tree.client}")
-            logger.debug(f"Loaded the following commands: {await self.tree.fetch_commands()}")
-        except Exception as e:
-            print(f"{e.__class__.__name__}: {e}")
+        # on_ready fires again on every reconnect, but the commands only need syncing once
+        if self._synced:
+            return
 
-    async def on_error(self, event_method: str, /, *args: asyncio.Any, **kwargs: asyncio.Any) -> None:
-        return await super().on_error(event_method, *args, **kwargs)
+        try:
+            command_hash = self._command_hash()
+            if COMMAND_HASH_PATH.is_file() and COMMAND_HASH_PATH.read_text() == command_hash:
+                logger.info("Commands are unchanged since the last sync, skipping it.")
+            else:
+                await self.tree.sync()
+                COMMAND_HASH_PATH.parent.mkdir(parents=True, exist_ok=True)
+                COMMAND_HASH_PATH.write_text(command_hash)
+            self._synced = True
+            # Pass arguments instead of f-strings, so loguru only formats what it emits
+            logger.info("Logged in as {}", self.user)
+            logger.debug("Command tree client: {}", self.tree.client)
+        except Exception:
+            logger.exception("Failed to sync the command tree")
 
-discord.utils.setup_logging()
+# discord.py logs every gateway event at INFO, which is just noise outside of development
+discord.utils.setup_logging(level=logging.DEBUG if DEBUG else logging.WARNING)
 bot = BookmarkBot()
 
 async def main() -> None:
-        async with db.conn(os.getenv("DB_BOT_TOKEN")):
+        if DEBUG:
+            # Surface anything that blocks the event loop for longer than 50ms
+            asyncio.get_running_loop().slow_callback_duration = 0.05
+
+        # Client's context manager sets up the bot's session and closes it on exit
+        async with bot:
+            # Bring the database up while the bot logs in, instead of one after the other
+            db.login_task(DB_TOKEN)
             try:
-                await bot.start(os.getenv("BOOKMARK_BOT_TOKEN"))
+                await bot.login(BOT_TOKEN)
+                # Commands query the database, so don't take any until it's ready
+                await db.wait_ready()
+                await bot.connect()
             finally:
-                await bot.close()
+                if db.open:
+                    await db.close()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    # uvloop is an optional speedup, fall back to the default loop without it
+    if uvloop is not None:
+        uvloop.run(main(), debug=DEBUG)
+    else:
+        asyncio.run(main(), debug=DEBUG)
@@ -1,3 +1,5 @@
+from __future__ import annotations
+
 from demobot_config import db
 
 import discobase
@@ -10,3 +12,21 @@ class BookmarkedMessage(discobase.Table):
     author_name: str
     author_avatar_url: str
     message_content: str
+    # Everything below was added later, so it needs a default for older bookmarks to load.
+    # Only bookmarks saved in between store the URL, newer ones store the IDs it's built from.
+    message_jump_url: str = ""
+    guild_id: int = 0
+    channel_id: int = 0
+    message_id: int = 0
+
+    @property
+    def jump_url(self) -> str | None:
+        """Link to the bookmarked message, or `None` if the bookmark is too old to have one."""
+        if self.message_jump_url:
+            return self.message_jump_url
+
+        if not self.message_id:
+            return None
+
+        # Direct messages don't have a guild
+        return f"https://discord.com/channels/{self.guild_id or '@me'}/{self.channel_id}/{self.message_id}"
@@ -2,43 +2,100 @@ from __future__ import annotations
 
 import asyncio
 import hashlib
-from base64 import urlsafe_b64decode, urlsafe_b64encode
-from collections.abc import Iterable
+import json
+from bisect import bisect_right
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Iterable
+from contextlib import asynccontextmanager
 from datetime import timedelta
-from functools import lru_cache
-from typing import TYPE_CHECKING, Any, Callable, List, Optional
+from typing import (TYPE_CHECKING, Any, Callable, Coroutine, List,
+                    Optional)
 
 import discord
-from aiocache import cached
 from discord.utils import snowflake_time, time_snowflake
 from loguru import logger
 from pydantic import BaseModel, ValidationError
+from pydantic_core import from_json
 
 from ._metadata import Metadata
+from ._util import free_fly
 from .exceptions import (DatabaseCorruptionError, DatabaseLookupError,
                          DatabaseStorageError)
 
+try:
+    # pybase64 is a drop-in replacement that uses SIMD kernels, which
+    # helps when reading tables full of legacy base64 records.
+    from pybase64 import urlsafe_b64decode
+except ImportError:
+    from base64 import urlsafe_b64decode
+
 if TYPE_CHECKING:
     from .table import Table
 
 __all__ = ("TableCursor",)
 
+MESSAGE_CACHE_SIZE = 4096
+"""Maximum number of index messages that a cursor keeps cached."""
+HASH_CACHE_SIZE = 4096
+"""Maximum number of string hashes that a cursor keeps cached."""
+RESIZE_EDIT_BATCH = 5
+"""Number of edits sent at once when rewriting a resized channel."""
+
 
 class _Record(BaseModel):
     content: str
-    """Base64 encoded Pydantic model dump of the record."""
+    """
+    Pydantic model dump of the record.
+
+    Records written by older versions of discobase are base64 encoded,
+    which `decode_content` still understands.
+    """
 
     @classmethod
     def from_data(cls, data: Table) -> _Record:
-        logger.debug(f"Generating a _Record from data: {data}")
-        return _Record(
-            content=urlsafe_b64encode(  # Record JSON data is stored in base64
-                data.model_dump_json().encode("utf-8"),
-            ).decode("utf-8"),
-        )
+        logger.debug("Generating a _Record from data: {}", data)
+        return _Record(content=data.model_dump_json())
 
     def decode_content(self, record: Table | type[Table]) -> Table:
-        return record.model_validate_json(urlsafe_b64decode(self.content))
+        content = self.content
+        # JSON objects always start with a brace, which isn't part
+        # of the base64 alphabet.
+        if not content.startswith("{"):
+            logger.debug("Found a legacy base64 record, decoding it.")
+            return record.model_validate_json(urlsafe_b64decode(content))
+
+        return record.model_validate_json(content)
+
+    @classmethod
+    def decode_message(
+        cls,
+        message: str,
+        record: Table | type[Table],
+    ) -> Table:
+        """
+        Decode the record stored in a message of the main table.
+
+        This is the same as `model_validate_json(message).decode_content()`,
+        but it doesn't build a `_Record` just to read its content.
+
+        Args:
+            message: Message content of the record.
+            record: Table to validate the record with.
+
+        Returns:
+            Table: The decoded record.
+        """
+        try:
+            content = from_json(message)["content"]
+        except (ValueError, TypeError, KeyError) as e:
+            raise DatabaseCorruptionError(
+                f"got bad _Record entry: {message}"
+            ) from e
+
+        if not isinstance(content, str):
+            raise DatabaseCorruptionError(f"got bad _Record entry: {message}")
+
+        return cls.model_construct(content=content).decode_content(record)
 
 
 class _IndexableRecord(BaseModel):
@@ -52,6 +109,29 @@ class _IndexableRecord(BaseModel):
     Only for use in resizing.
     """
 
+    def dump(self) -> str:
+        """
+        Serialize the record to JSON.
+
+        This produces the same output as `model_dump_json()`, but skips
+        Pydantic's serializer, which matters when rewriting every index
+        entry during a resize.
+
+        Returns:
+            str: The JSON representation of the record.
+        """
+        next_value = self.next_value.dump() if self.next_value else "null"
+        record_ids = ",".join(map(str, self.record_ids))
+        return (
+            '{"key":'
+            + str(self.key)
+            + ',"record_ids":['
+            + record_ids
+            + '],"next_value":'
+            + next_value
+            + "}"
+        )
+
     @classmethod
     def from_message(cls, message: str) -> _IndexableRecord | None:
         """
@@ -64,7 +144,7 @@ class _IndexableRecord(BaseModel):
             _IndexableRecord | None: An `_IndexableRecord` instance, or `None`,
                 if the message was `null`.
         """
-        logger.debug(f"Parsing {message} into an _IndexableRecord")
+        logger.debug("Parsing {} into an _IndexableRecord", message)
         try:
             return (
                 cls.model_validate_json(message) if message != "null" else None
@@ -77,8 +157,10 @@ class _IndexableRecord(BaseModel):
 
 class _HashTransport:
     """
-    Hacky object to use `hash()` for tuples and dictionaries
-    that retains the value between interpreters.
+    Hacky object to use `hash()` for tuples that retains the value
+    between interpreters.
+
+    This is only used by tables on hash version 1.
     """
 
     def __init__(self, hash_num: int) -> None:
@@ -88,6 +170,73 @@ class _HashTransport:
         return self.hash_num
 
 
+def _json_default(value: Any) -> Any:
+    """
+    Convert the types that `json` can't serialize on its own.
+
+    Sets are sorted by the canonical JSON of their items, so that
+    they serialize the same way regardless of iteration order.
+    """
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=_canonical_json)
+
+    if isinstance(value, (bytes, bytearray)):
+        return value.hex()
+
+    raise TypeError(f"{value!r} is not JSON serializable")
+
+
+def _stringify_keys(value: Any) -> Any:
+    """
+    Recursively convert all dictionary keys in `value` to strings.
+    """
+    if isinstance(value, dict):
+        return {
+            (
+                key.hex()
+                if isinstance(key, (bytes, bytearray))
+                else str(key)
+            ): _stringify_keys(item)
+            for key, item in value.items()
+        }
+
+    if isinstance(value, (list, tuple)):
+        return [_stringify_keys(item) for item in value]
+
+    # Sets can't contain dictionaries, so they're left for `_json_default`.
+
+    return value
+
+
+def _canonical_json(value: Any) -> str:
+    """
+    Serialize `value` into a JSON string that is the same for equal values.
+
+    Args:
+        value: Object to serialize.
+
+    Returns:
+        str: The canonical JSON.
+    """
+    try:
+        return json.dumps(
+            value,
+            sort_keys=True,
+            separators=(",", ":"),
+            default=_json_default,
+        )
+    except TypeError:
+        # `sort_keys` can't compare keys of different types (and `json`
+        # rejects some key types outright), so fall back to string keys.
+        # This only happens for such values, so it stays consistent.
+        return json.dumps(
+            _stringify_keys(value),
+            sort_keys=True,
+            separators=(",", ":"),
+            default=_json_default,
+        )
+
+
 class TableCursor:
     def __init__(
         self,
@@ -98,24 +247,119 @@ class TableCursor:
         self.metadata = metadata
         self.metadata_channel = metadata_channel
         self.guild = guild
+        self._channels_by_id: dict[int, discord.TextChannel] = {
+            channel.id: channel
+            for channel in guild.channels
+            if isinstance(channel, discord.TextChannel)
+        }
+        """Text channels in the guild, keyed by their ID."""
+        self._index_channel_names: dict[str, str] = {
+            key: f"{metadata.name}_{key}" for key in metadata.keys
+        }
+        """Names of the index channels, keyed by field."""
+        self._hash_cache: dict[str, int] = {}
+        """Cache of string hashes, see `_hash`."""
+        self._range_index: list[tuple[int, int, int]] = []
+        """
+        Entries of `metadata.time_table` as `(start, end, timestamp)`,
+        sorted by the start of the range.
+        """
+        self._build_range_index()
+        self.write_version: int = 0
+        """
+        Incremented after every record write, update, or deletion. Caches
+        of query results can compare this to tell if they're stale.
+        """
+        self._write_lock = asyncio.Lock()
+        """
+        Held while a record is written, updated or deleted.
 
-    @lru_cache
-    def _find_channel(self, channel_id: int) -> discord.TextChannel:
-        for channel in self.guild.channels:
-            if channel.id != channel_id:
-                continue
+        Index entries are updated by reading and then rewriting their
+        message, and `Table.save()` and friends run as background tasks,
+        so concurrent writes could otherwise clobber each other's entries
+        or resize the table under each other.
+        """
+        self._metadata_write: asyncio.Task[discord.Message] | None = None
+        """
+        Metadata edit that was started without being awaited, see
+        `create_table`.
+        """
+        self._index_mask: int | None = None
+        """
+        `max_records - 1` if `max_records` is a power of two, which lets
+        `_to_index` use a mask instead of a modulo. See `_update_index_mask`.
+        """
+        self._update_index_mask()
+        self._message_cache: OrderedDict[
+            tuple[int, int], discord.Message
+        ] = OrderedDict()
+        """LRU cache of `(channel ID, index)` to the index message."""
+        self._known_messages: OrderedDict[int, discord.Message] = OrderedDict()
+        """
+        LRU cache of message ID to the latest version of an index message.
 
-            if not isinstance(channel, discord.TextChannel):
-                raise DatabaseCorruptionError(
-                    f"{channel!r} is not a TextChannel"
-                )
+        Every index edit goes through `_edit_index_message`, which keeps
+        this up to date. That only holds if this cursor is the only writer
+        to the table (see `Database`), so slots that look free are still
+        refetched before anything is written to them.
+        """
 
-            return channel
+    @asynccontextmanager
+    async def _writing(self) -> AsyncIterator[None]:
+        """
+        Hold the write lock, and bump `write_version` once the write is done
+        (or has failed partway through).
+        """
+        async with self._write_lock:
+            try:
+                yield
+            finally:
+                self.write_version += 1
 
-        raise DatabaseCorruptionError(
-            f"could not find channel with id {channel_id}"
+    def _update_index_mask(self) -> None:
+        """
+        Regenerate `_index_mask` from the metadata's `max_records`.
+
+        This has to be called whenever the table is resized.
+        """
+        max_records = self.metadata.max_records
+        # Tables start at a power of two (by default) and only ever
+        # double, but `initial_size` can be anything.
+        if max_records > 0 and not (max_records & (max_records - 1)):
+            self._index_mask = (max_records - 1) & 0x7FFFFFFF
+        else:
+            self._index_mask = None
+
+    def _build_range_index(self) -> None:
+        """
+        Regenerate `_range_index` from the metadata's `time_table`.
+
+        This has to be called whenever the time table changes.
+        """
+        self._range_index = sorted(
+            (start, end, timestamp)
+            for timestamp, (start, end) in self.metadata.time_table.items()
         )
 
+    def _find_channel(self, channel_id: int) -> discord.TextChannel:
+        channel = self._channels_by_id.get(channel_id)
+        if channel:
+            return channel
+
+        # The channel might have shown up after the cursor was created, so
+        # fall back to discord.py's own cache before giving up.
+        found = self.guild.get_channel(channel_id)
+        if not found:
+            raise DatabaseCorruptionError(
+                f"could not find channel with id {channel_id}"
+            )
+
+        if not isinstance(found, discord.TextChannel):
+            raise DatabaseCorruptionError(f"{found!r} is not a TextChannel")
+
+        self._channels_by_id[channel_id] = found
+        return found
+
     async def _find_collision_message(
         self,
         channel: discord.TextChannel,
@@ -136,7 +380,8 @@ class TableCursor:
             discord.Message: The message that satisfies search_func
         """
         logger.debug(
-            f"Looking up hash collision entry using search function: {search_func}"  # noqa
+            "Looking up hash collision entry using search function: {}",
+            search_func,
         )
         offset: int = index
         while True:
@@ -156,11 +401,24 @@ class TableCursor:
                 offset,
             )
             logger.debug(
-                f"Hash collision search at index: {offset} {message=}",
+                "Hash collision search at index: {} message={!r}",
+                offset,
+                message,
             )
             if search_func(message.content):
+                # The caller is about to edit this message based on its
+                # content, so make sure that content isn't stale.
+                message = await self._lookup_message(
+                    channel,
+                    offset,
+                    refresh=True,
+                )
+                if not search_func(message.content):
+                    continue
+
                 logger.debug(
-                    f"Done searching for collision message: {message.content}"
+                    "Done searching for collision message: {}",
+                    message.content,
                 )
                 return message
 
@@ -177,7 +435,7 @@ class TableCursor:
         a handy utility to use when you only have the message ID.
         """
         editable_message = await channel.fetch_message(mid)
-        logger.debug(f"Editing message (ID {mid}) to {content}")
+        logger.debug("Editing message (ID {}) to {}", mid, content)
         await editable_message.edit(content=content)
 
     def _to_index(self, value: int) -> int:
@@ -191,13 +449,19 @@ class TableCursor:
         Returns:
             int: Index in range of `metadata.max_records`.
         """
-        index = (value & 0x7FFFFFFF) % self.metadata.max_records
+        mask = self._index_mask
+        if mask is not None:
+            index = value & mask
+        else:
+            index = (value & 0x7FFFFFFF) % self.metadata.max_records
         logger.debug(
-            f"Hashed value {value} turned into index: {index} ({self.metadata.max_records=})"  # noqa
+            "Hashed value {} turned into index: {} (max_records={})",
+            value,
+            index,
+            self.metadata.max_records,
         )
         return index
 
-    @lru_cache()
     def _hash(
         self,
         value: Any,
@@ -212,32 +476,70 @@ class TableCursor:
             int: An integer, positive or negative, representing a unique hash.
                 This is always the same thing across programs.
         """
-        logger.debug(f"Hashing object: {value!r}")
+        logger.debug("Hashing object: {!r}", value)
         if isinstance(value, str):
-            hashed_str = int(
-                hashlib.sha1(value.encode("utf-8")).hexdigest(),
-                16,
-            )
-            logger.debug(f"Hashed string {value!r} into {hashed_str}")
-            return hashed_str
-        elif isinstance(value, dict):
-            transport: dict[_HashTransport, _HashTransport] = {}
-
-            for k, v in value.items():
-                transport[_HashTransport(self._hash(k))] = _HashTransport(
-                    self._hash(v)
+            # Strings are the only thing worth caching -- integers hash
+            # to themselves, and containers (which `lru_cache` used to
+            # choke on) aren't hashable to begin with.
+            cached_hash = self._hash_cache.get(value)
+            if cached_hash is not None:
+                return cached_hash
+
+            if self.metadata.hash_version >= 2:
+                hashed_str = int.from_bytes(
+                    hashlib.blake2b(
+                        value.encode("utf-8"),
+                        digest_size=8,
+                    ).digest(),
+                    "big",
+                )
+            else:
+                # This is the same number as parsing the hexdigest, without
+                # the round-trip through a hex string.
+                hashed_str = int.from_bytes(
+                    hashlib.sha1(value.encode("utf-8")).digest(),
+                    "big",
                 )
+            logger.debug("Hashed string {!r} into {}", value, hashed_str)
+            if len(self._hash_cache) >= HASH_CACHE_SIZE:
+                # Dictionaries keep insertion order, so this evicts the
+                # oldest entry. Hits are far more common than misses, so
+                # it's not worth paying for LRU bookkeeping on every hit.
+                del self._hash_cache[next(iter(self._hash_cache))]
+
+            self._hash_cache[value] = hashed_str
+            return hashed_str
+        elif isinstance(value, (dict, Iterable)) and (
+            # Dictionaries never worked under the old scheme, since
+            # dictionaries themselves aren't hashable, so there's nothing
+            # to stay compatible with.
+            self.metadata.hash_version >= 2
+            or isinstance(value, dict)
+        ):
+            # Containers are hashed as their canonical JSON, which is a
+            # single C call instead of recursing into `_hash` per item.
+            try:
+                serialized = _canonical_json(value).encode("utf-8")
+            except (TypeError, ValueError) as e:
+                raise DatabaseStorageError(f"unhashable: {value!r}") from e
 
-            hashed_dict = hash(transport)
-            logger.debug(f"Hashed dictionary {value!r} into {hashed_dict}")
-            return hashed_dict
+            hashed_container = int.from_bytes(
+                hashlib.blake2b(serialized, digest_size=8).digest(),
+                "big",
+            )
+            logger.debug(
+                "Hashed container {!r} into {}",
+                value,
+                hashed_container,
+            )
+            return hashed_container
         elif isinstance(value, Iterable):
             hashes: list[_HashTransport] = []
             for item in value:
                 hashes.append(_HashTransport(self._hash(item)))
 
             hashed_tuple = hash(tuple(hashes))
-            logger.debug(f"Hashed iterable {value!r} into {hashed_tuple}")
+            logger.debug("Hashed iterable {!r} into {}", value, hashed_tuple)
             return hashed_tuple
         elif isinstance(value, int):
             return value
@@ -254,7 +556,73 @@ class TableCursor:
         hashed = self._hash(value)
         return hashed, self._to_index(hashed)
 
-    @cached()
+    def _as_hashed_many(
+        self,
+        items: dict[str, Any],
+    ) -> dict[str, tuple[int, int]]:
+        """
+        Get the hash number and index for every value in `items`.
+
+        This is the same as calling `_as_hashed` on each value, but
+        it only looks up the table size once.
+
+        Args:
+            items: Dictionary of field names to values.
+
+        Returns:
+            dict[str, tuple[int, int]]: Dictionary of field names to
+                their hash number and index.
+        """
+        hashes: dict[str, tuple[int, int]] = {}
+        mask = self._index_mask
+        if mask is not None:
+            for field, value in items.items():
+                hashed = self._hash(value)
+                hashes[field] = (hashed, hashed & mask)
+        else:
+            max_records = self.metadata.max_records
+            for field, value in items.items():
+                hashed = self._hash(value)
+                hashes[field] = (hashed, (hashed & 0x7FFFFFFF) % max_records)
+
+        logger.debug("Hashed fields: {}", hashes)
+        return hashes
+
+    def _find_range(self, index: int) -> tuple[int, int, int] | None:
+        """
+        Find the entry in `_range_index` that contains `index`.
+
+        Args:
+            index: Index in the table.
+
+        Returns:
+            tuple[int, int, int] | None: The `(start, end, timestamp)` entry,
+                or `None` if no range contains the index.
+        """
+        range_index = self._range_index
+        if not range_index:
+            return None
+
+        # Each resize doubles the table, so the ranges go
+        # [0, n), [n, 2n), [2n, 4n), and so on. That means the
+        # generation of an index is just the bit length of index // n.
+        initial_size = range_index[0][1]
+        generation = (index // initial_size).bit_length()
+        if generation < len(range_index):
+            entry = range_index[generation]
+            if entry[0] <= index < entry[1]:
+                return entry
+
+        # The table wasn't grown purely by doubling, fall back to a
+        # binary search. The ranges never overlap, so the only candidate
+        # is the last range that starts at or before the index.
+        position = bisect_right(range_index, (index + 1,)) - 1
+        if position < 0:
+            return None
+
+        entry = range_index[position]
+        return entry if index < entry[1] else None
+
     async def _lookup_message_impl(
         self,
         channel: discord.TextChannel,
@@ -275,39 +643,134 @@ class TableCursor:
         Raises:
             DatabaseCorruptionError: Could not find the index.
         """
-        metadata = self.metadata
-        logger.debug(f"Looking up message: {index}")
-        for timestamp, rng in metadata.time_table.items():
-            start: int = rng[0]
-            end: int = rng[1]
-            if index not in range(
-                start, end
-            ):  # Pydantic doesn't support ranges
-                continue
+        key = (channel.id, index)
+        cache = self._message_cache
+        cached_message = cache.get(key)
+        if cached_message:
+            cache.move_to_end(key)
+            return cached_message
 
-            logger.debug(f"In range: {start} - {end}")
-            current_index: int = 0
-            async for msg in channel.history(
-                limit=end - start,
-                before=snowflake_time(timestamp),
-            ):
-                if current_index == (index - start):
-                    logger.debug(f"{msg} found at index {current_index}")
-                    return msg
-                current_index += 1
+        return await self._find_index_message(channel, index)
 
+    def _cache_message(
+        self,
+        channel: discord.TextChannel,
+        index: int,
+        message: discord.Message,
+    ) -> None:
+        """
+        Store an index message in the lookup cache, evicting the
+        least recently used entry if the cache is full.
+        """
+        cache = self._message_cache
+        key = (channel.id, index)
+        cache[key] = message
+        cache.move_to_end(key)
+        if len(cache) > MESSAGE_CACHE_SIZE:
+            cache.popitem(last=False)
+
+    def _remember_message(self, message: discord.Message) -> None:
+        """
+        Store the latest version of an index message.
+        """
+        known = self._known_messages
+        known[message.id] = message
+        known.move_to_end(message.id)
+        if len(known) > MESSAGE_CACHE_SIZE:
+            known.popitem(last=False)
+
+    def _forget_message(self, message: discord.Message) -> None:
+        """
+        Drop an index message from every cache.
+        """
+        self._known_messages.pop(message.id, None)
+        for key, cached in list(self._message_cache.items()):
+            if cached.id == message.id:
+                del self._message_cache[key]
+
+    async def _edit_index_message(
+        self,
+        message: discord.Message,
+        content: str,
+    ) -> discord.Message:
+        """
+        Edit an index message, and remember the edited version so
+        `_lookup_message` doesn't have to refetch it.
+
+        Args:
+            message: Index message to edit.
+            content: New content of the message.
+
+        Returns:
+            discord.Message: The edited message.
+        """
+        try:
+            edited = await message.edit(content=content)
+        except discord.NotFound as e:
+            # Someone deleted the message from under us, don't keep
+            # handing out the cached copy.
+            self._forget_message(message)
             raise DatabaseCorruptionError(
-                f"range for {timestamp} in table {metadata.name} does not contain index {index}"  # noqa
+                f"index message {message.id} was deleted"
+            ) from e
+
+        self._remember_message(edited)
+        return edited
+
+    async def _find_index_message(
+        self,
+        channel: discord.TextChannel,
+        index: int,
+    ) -> discord.Message:
+        """
+        Find the message at `index` by walking the channel's history.
+        This is uncached, use `_lookup_message_impl` instead.
+
+        Every message passed on the way is cached as well, as the walk
+        already paid for fetching it.
+
+        Args:
+            channel: Index channel to search.
+            index: Index to get.
+
+        Returns:
+            discord.Message: The found message.
+
+        Raises:
+            DatabaseCorruptionError: Could not find the index.
+        """
+        metadata = self.metadata
+        logger.debug("Looking up message: {}", index)
+        found_range = self._find_range(index)
+        if not found_range:
+            raise DatabaseCorruptionError(
+                f"message index out of range for table {metadata.name}: {index}"  # noqa
             )
 
+        start, end, timestamp = found_range
+
+        logger.debug("In range: {} - {}", start, end)
+        current_index: int = 0
+        async for msg in channel.history(
+            limit=end - start,
+            before=snowflake_time(timestamp),
+        ):
+            self._cache_message(channel, start + current_index, msg)
+            if current_index == (index - start):
+                logger.debug("{} found at index {}", msg, current_index)
+                return msg
+            current_index += 1
+
         raise DatabaseCorruptionError(
-            f"message index out of range for table {metadata.name}: {index}"
+            f"range for {timestamp} in table {metadata.name} does not contain index {index}"  # noqa
         )
 
     async def _lookup_message(
         self,
         channel: discord.TextChannel,
         index: int,
+        *,
+        refresh: bool = False,
     ) -> discord.Message:
         """
         Lookup a message by it's index in the table.
@@ -315,6 +778,7 @@ class TableCursor:
         Args:
             channel: Index channel to search.
             index: Index to get.
+            refresh: Refetch the message even if its latest version is known.
 
         Returns:
             discord.Message: The found message.
@@ -322,8 +786,17 @@ class TableCursor:
         Raises:
             DatabaseCorruptionError: Could not find the index.
         """
-        # We need to refetch it for the latest content.
-        return await (await self._lookup_message_impl(channel, index)).fetch()
+        message = await self._lookup_message_impl(channel, index)
+        known = self._known_messages.get(message.id)
+        if known and not refresh:
+            self._known_messages.move_to_end(message.id)
+            return known
+
+        # The cached message might have been edited since, so we need to
+        # refetch it for the latest content.
+        fetched = await message.fetch()
+        self._remember_message(fetched)
+        return fetched
 
     async def _resize_hash(
         self,
@@ -368,7 +841,9 @@ class TableCursor:
         """
         metadata = self.metadata
         logger.debug(
-            f"Resizing channel: {channel!r} for table {metadata.name}",
+            "Resizing channel: {!r} for table {}",
+            channel,
+            metadata.name,
         )
         old_size: int = metadata.max_records // 2
         timestamp_snowflake = await self._resize_hash(channel, old_size)
@@ -386,6 +861,7 @@ class TableCursor:
                 del metadata.time_table[snowflake]
 
         metadata.time_table[timestamp_snowflake] = rng
+        self._build_range_index()
         # Now, we have to move everything into the correct position.
         #
         # Note that this shouldn't put everything into memory, as
@@ -410,6 +886,15 @@ class TableCursor:
             )
 
             next_record = _IndexableRecord.from_message(target.content)
+            if not next_record:
+                # We're about to overwrite this, make sure it's really free.
+                target = await self._lookup_message(
+                    channel,
+                    new_index,
+                    refresh=True,
+                )
+                next_record = _IndexableRecord.from_message(target.content)
+
             inplace: bool = True
             overwrite: bool = True
 
@@ -430,7 +915,9 @@ class TableCursor:
                     logger.info("Updating record at the new index.")
                     inplace = False
                     logger.debug(
-                        f"{next_record} marked as the next value location ({target.id=})"  # noqa
+                        "{} marked as the next value location (target.id={})",
+                        next_record,
+                        target.id,
                     )
 
                     if record.next_value:
@@ -442,9 +929,9 @@ class TableCursor:
                         overwrite = False
 
                     next_record.next_value = record
-                    content = next_record.model_dump_json()
-                    logger.debug(f"Editing {target.content} to {content}")
-                    await target.edit(content=content)
+                    content = next_record.dump()
+                    logger.debug("Editing {} to {}", target.content, content)
+                    await self._edit_index_message(target, content)
 
             if inplace:
                 # In case of a hash collision, we want to mark
@@ -461,15 +948,15 @@ class TableCursor:
                 logger.info(
                     "Target index does not have an entry, updating in-place."  # noqa
                 )
-                content = copy.model_dump_json()
-                logger.debug(f"Editing in-place null to {content}")
+                content = copy.dump()
+                logger.debug("Editing in-place null to {}", content)
                 assert target.content == "null"
-                await target.edit(content=content)
+                await self._edit_index_message(target, content)
 
             # Technically speaking, the index could
             # remain the same. We need to check for that.
             if (not record.next_value) and (target != msg) and overwrite:
-                await msg.edit(content="null")
+                await self._edit_index_message(msg, "null")
 
         # Finally, all the next_value attributes have been set, we can
         # go through and update each record.
@@ -480,15 +967,25 @@ class TableCursor:
         #
         # This algorithm is pretty much infinitely scalable
         # in terms of memory, but we're limited by Discord's ratelimit.
+        #
+        # Each message only depends on its own content here, so the edits
+        # are sent in small batches that match the size of the per-channel
+        # bucket. discord.py waits out the ratelimit between batches, but
+        # we don't sit idle on a round-trip for every single edit.
+        pending: list[Coroutine] = []
         async for msg in channel.history(
             limit=metadata.max_records,
             oldest_first=True,
         ):
+            if len(pending) >= RESIZE_EDIT_BATCH:
+                await asyncio.gather(*pending)
+                pending.clear()
+
             record = _IndexableRecord.from_message(msg.content)
             if not record:
                 continue
 
-            logger.debug(f"Handling movement of {record!r}")
+            logger.debug("Handling movement of {!r}", record)
             if not record.next_value:
                 raise DatabaseCorruptionError(
                     "all existing records after resize should have next_value",  # noqa
@@ -499,9 +996,11 @@ class TableCursor:
                     f"doubly nested next_value found: {record.next_value.next_value!r} in {record!r}"  # noqa
                 )
 
-            content = record.next_value.model_dump_json()
-            logger.debug(f"Replacing {msg.content} with {content}")
-            await msg.edit(content=content)
+            content = record.next_value.dump()
+            logger.debug("Replacing {} with {}", msg.content, content)
+            pending.append(self._edit_index_message(msg, content))
+
+        await asyncio.gather(*pending)
 
     async def _resize_table(self) -> None:
         """
@@ -509,6 +1008,7 @@ class TableCursor:
         """
         metadata = self.metadata
         metadata.max_records *= 2
+        self._update_index_mask()
         logger.info(
             f"Resizing table {metadata.name} to {metadata.max_records}"  # noqa
         )
@@ -520,20 +1020,44 @@ class TableCursor:
         )
 
         # Dump the new metadata
+        await self._flush_metadata()
+        logger.info(
+            f"Table {metadata.name} is now of size {metadata.max_records}"
+        )
+
+    async def _flush_metadata(self) -> None:
+        """
+        Write the in-memory metadata to the metadata channel.
+        """
+        if self._metadata_write:
+            # Make sure the pending edit can't land after this one and
+            # overwrite it with older metadata.
+            try:
+                await self._metadata_write
+            except Exception as e:
+                # The full dump below replaces that edit anyway.
+                logger.opt(exception=e).warning(
+                    "Failed to store the metadata message ID, rewriting it."
+                )
+            finally:
+                self._metadata_write = None
+
+        metadata = self.metadata
         await self._edit_message(
             self.metadata_channel,
             metadata.message_id,
             metadata.model_dump_json(),
         )
-        logger.info(
-            f"Table {metadata.name} is now of size {metadata.max_records}"
-        )
 
     async def _inc_records(self) -> None:
         """
         Increment the `current_records` number on the
         target metadata. This resizes the table if the maximum
         size is reached.
+
+        This does not write the new count to the metadata channel
+        (unless a resize happens), so callers should `_flush_metadata()`
+        once they're done writing.
         """
         metadata = self.metadata
         metadata.current_records += 1
@@ -541,11 +1065,21 @@ class TableCursor:
             logger.info("The table is full! We need to resize it.")
             await self._resize_table()
 
-        await self._edit_message(
-            self.metadata_channel,
-            metadata.message_id,
-            metadata.model_dump_json(),
-        )
+    async def _reserve_records(self, amount: int) -> None:
+        """
+        Resize the table ahead of time so that `amount` more index
+        entries can be written without triggering a resize.
+
+        This is needed before writing index entries concurrently, as
+        resizing moves entries that other writes might be looking at.
+
+        Args:
+            amount: Number of index entries that are about to be written.
+        """
+        metadata = self.metadata
+        while (metadata.current_records + amount) > metadata.max_records:
+            logger.info("The table would be full! We need to resize it.")
+            await self._resize_table()
 
     async def _write_index_record(
         self,
@@ -571,6 +1105,17 @@ class TableCursor:
         serialized_content = _IndexableRecord.from_message(
             entry_message.content
         )
+        if not serialized_content:
+            # The known version of the message might be stale, and writing
+            # over an entry that isn't actually free would lose it.
+            entry_message = await self._lookup_message(
+                channel,
+                index,
+                refresh=True,
+            )
+            serialized_content = _IndexableRecord.from_message(
+                entry_message.content
+            )
 
         if not serialized_content:
             logger.info("This is a null entry, we can just update in place.")
@@ -581,7 +1126,10 @@ class TableCursor:
                     record_id,
                 ],
             )
-            await entry_message.edit(content=message_content.model_dump_json())
+            await self._edit_index_message(
+                entry_message,
+                message_content.dump(),
+            )
         elif serialized_content.key == hashed:
             # See https://github.com/ZeroIntensity/discobase/issues/50
             #
@@ -589,8 +1137,9 @@ class TableCursor:
             # using up a `null` space.
             logger.info("This already exists, let's append to the data.")
             serialized_content.record_ids.append(record_id)
-            await entry_message.edit(
-                content=serialized_content.model_dump_json()
+            await self._edit_index_message(
+                entry_message,
+                serialized_content.dump(),
             )
         else:
             logger.info("Hash collision!")
@@ -605,7 +1154,10 @@ class TableCursor:
                     record_id,
                 ],
             )
-            await index_message.edit(content=collision_entry.model_dump_json())
+            await self._edit_index_message(
+                index_message,
+                collision_entry.dump(),
+            )
 
     async def add_record(self, record: Table) -> discord.Message:
         """
@@ -627,19 +1179,118 @@ class TableCursor:
             record_data.model_dump_json(), silent=True
         )
 
-        for field, value in record.model_dump().items():
+        async with self._writing():
+            await self._index_record(message.id, record.model_dump())
+            await self._flush_metadata()
+
+        return await message.edit(content=record_data.model_dump_json())
+
+    async def _index_record(
+        self,
+        record_id: int,
+        fields: dict[str, Any],
+    ) -> None:
+        """
+        Write the index entries of a record. The caller should hold the
+        write lock, and `_flush_metadata()` afterwards.
+
+        Args:
+            record_id: Message ID of the record in the main table.
+            fields: The record's fields, per `model_dump()`.
+        """
+        metadata = self.metadata
+        # Each field lives in its own index channel, so the writes can
+        # happen concurrently -- but only if none of them resize the table
+        # from under the others.
+        await self._reserve_records(len(fields))
+        coros: list[Coroutine] = []
+        for field, (hashed_field, target_index) in self._as_hashed_many(
+            fields
+        ).items():
             channel = self._find_channel(
-                metadata.index_channels[f"{record.__disco_name__}_{field}"]
+                metadata.index_channels[self._index_channel_names[field]]
             )
-            hashed_field, target_index = self._as_hashed(value)
-            await self._write_index_record(
-                channel,
-                target_index,
-                hashed_field,
-                message.id,
+            coros.append(
+                self._write_index_record(
+                    channel,
+                    target_index,
+                    hashed_field,
+                    record_id,
+                )
             )
 
-        return await message.edit(content=record_data.model_dump_json())
+        await asyncio.gather(*coros)
+
+    async def _reindex(
+        self,
+        table: type[Table],
+        old_keys: Iterable[str],
+    ) -> None:
+        """
+        Rebuild every index channel from the records in the main table,
+        using the keys of `table`.
+
+        This is how fields are added to an existing table: the time table
+        is shared by all index channels, so a new channel can't just be
+        created next to the old ones.
+
+        Args:
+            table: Table schema to build the index for.
+            old_keys: Keys the index was previously built for.
+        """
+        metadata = self.metadata
+        logger.info(f"Rebuilding the index of table {metadata.name}")
+        names: set[str] = {
+            f"{metadata.name}_{key}"
+            for key in (*old_keys, *table.__disco_keys__)
+        }
+        # This also gets rid of channels left over by a rebuild that
+        # was interrupted.
+        for channel in list(self.guild.channels):
+            if channel.name in names:
+                await channel.delete()
+                self._channels_by_id.pop(channel.id, None)
+
+        self._message_cache.clear()
+        self._known_messages.clear()
+        self._index_channel_names = {
+            key: f"{metadata.name}_{key}" for key in table.__disco_keys__
+        }
+        size: int = metadata.max_records
+        timestamp_snowflake: int | None = None
+        index_channels: dict[str, int] = {}
+        for data in await asyncio.gather(
+            *[
+                self._gen_key_channel(
+                    metadata.name,
+                    key_name,
+                    initial_size=size,
+                )
+                for key_name in table.__disco_keys__
+            ]
+        ):
+            channel_name, channel_id, timestamp_snowflake = data
+            index_channels[channel_name] = channel_id
+
+        assert timestamp_snowflake is not None
+        metadata.keys = tuple(table.__disco_keys__)
+        metadata.index_channels = index_channels
+        metadata.time_table = {timestamp_snowflake: (0, size)}
+        metadata.current_records = 0
+        self._build_range_index()
+
+        main_table = self._find_channel(metadata.table_channel)
+        async with self._writing():
+            async for msg in main_table.history(
+                limit=None,
+                oldest_first=True,
+            ):
+                record = _Record.decode_message(msg.content, table)
+                await self._index_record(msg.id, record.model_dump())
+
+            await self._flush_metadata()
+
+        logger.info(f"Rebuilt the index of table {metadata.name}")
 
     async def update_record(self, record: Table) -> discord.Message:
         """
@@ -659,59 +1310,117 @@ class TableCursor:
         main_table: discord.TextChannel = self._find_channel(
             metadata.table_channel
         )
-        msg = await main_table.fetch_message(record.__disco_id__)
-        current = _Record.model_validate_json(msg.content).decode_content(
-            record
-        )
-        await msg.edit(content=_Record.from_data(record).model_dump_json())
-
-        for new, old in zip(
-            record.model_dump().items(),
-            current.model_dump().items(),
-        ):
-            field = new[0]
-            if field != old[0]:
-                raise DatabaseCorruptionError(
-                    f"field name {field} does not match {old[0]}"
-                )
+        async with self._writing():
+            msg = await main_table.fetch_message(record.__disco_id__)
+            current = _Record.decode_message(msg.content, record)
+            new_fields = record.model_dump()
+            old_fields = current.model_dump()
+            for field, old_field in zip(new_fields, old_fields):
+                if field != old_field:
+                    raise DatabaseCorruptionError(
+                        f"field name {field} does not match {old_field}"
+                    )
 
-            new_value = new[1]
-            old_value = old[1]
-            if new_value == old_value:
+            changed: dict[str, tuple[Any, Any]] = {
+                field: (new_value, old_fields[field])
+                for field, new_value in new_fields.items()
+                if new_value != old_fields[field]
+            }
+            if not changed:
                 logger.info("Nothing changed.")
-                continue
+                return msg
 
-            channel = self._find_channel(
-                metadata.index_channels[f"{record.__disco_name__}_{field}"]
+            # Like in add_record, make sure none of the concurrent index writes
+            # below can resize the table.
+            await self._reserve_records(len(changed))
+            new_hashes = self._as_hashed_many(
+                {field: values[0] for field, values in changed.items()}
             )
-            hashed_field, target_index = self._as_hashed(new_value)
-            await self._write_index_record(
-                channel,
-                target_index,
-                hashed_field,
-                msg.id,
+            old_hashes = self._as_hashed_many(
+                {field: values[1] for field, values in changed.items()}
             )
-
-            old_index = self._to_index(self._hash(old_value))
-            old_msg = await self._lookup_message(channel, old_index)
-            old_record = _IndexableRecord.from_message(old_msg.content)
-            if not old_record:
-                raise DatabaseCorruptionError(
-                    "got null record somehow",
+            coros: list[Coroutine] = [
+                msg.edit(content=_Record.from_data(record).model_dump_json())
+            ]
+            for field, (hashed_field, target_index) in new_hashes.items():
+                coros.append(
+                    self._update_index_record(
+                        self._find_channel(
+                            metadata.index_channels[
+                                self._index_channel_names[field]
+                            ]
+                        ),
+                        target_index,
+                        hashed_field,
+                        old_hashes[field][1],
+                        msg.id,
+                    )
                 )
 
-            if len(old_record.record_ids) == 1:
-                logger.info("We can nullify this entry.")
-                await old_msg.edit(content="null")
-                self.metadata.current_records -= 1
-            else:
-                logger.info(
-                    "There are other entries with this value, only remove this ID."  # noqa
-                )
-                old_record.record_ids.remove(msg.id)
-                await old_msg.edit(content=old_record.model_dump_json())
+            await asyncio.gather(*coros)
+            await self._flush_metadata()
+            return msg
 
-        return msg
+    async def _update_index_record(
+        self,
+        channel: discord.TextChannel,
+        index: int,
+        hashed: int,
+        old_index: int,
+        record_id: int,
+    ) -> None:
+        """
+        Move a record's index entry for a field to a new value.
+
+        Args:
+            channel: Index channel of the field.
+            index: Index of the new value in the table.
+            hashed: Integer hash of the new value.
+            old_index: Index of the old value in the table.
+            record_id: Message ID of the record in the main table.
+        """
+        await self._write_index_record(
+            channel,
+            index,
+            hashed,
+            record_id,
+        )
+
+        await self._remove_index_record(channel, old_index, record_id)
+
+    async def _remove_index_record(
+        self,
+        channel: discord.TextChannel,
+        index: int,
+        record_id: int,
+    ) -> None:
+        """
+        Remove a record from the index entry at `index`, nullifying the
+        entry if it was the only record with that value.
+
+        Args:
+            channel: Index channel of the field.
+            index: Index of the value in the table.
+            record_id: Message ID of the record in the main table.
+        """
+        index_message = await self._lookup_message(channel, index)
+        index_record = _IndexableRecord.from_message(index_message.content)
+        if not index_record:
+            raise DatabaseCorruptionError("got null record somehow")
+
+        if len(index_record.record_ids) == 1:
+            logger.info("We can nullify this entry.")
+            await self._edit_index_message(index_message, "null")
+            self.metadata.current_records -= 1
+        else:
+            logger.info(
+                "There are other entries with this value, only remove this ID."  # noqa
+            )
+            index_record.record_ids.remove(record_id)
+            await self._edit_index_message(
+                index_message,
+                index_record.dump(),
+            )
 
     async def find_records(
         self,
@@ -732,20 +1441,39 @@ class TableCursor:
         """
         metadata = self.metadata
         name = table.__disco_name__
-        sets_list: list[set[int]] = []
+        main_table = self._find_channel(metadata.table_channel)
+        records: list[Table] = []
 
         logger.debug(f"Looking for query {query!r} in {name}")
-        for field, value in query.items():
+        for field in query:
             if field not in metadata.keys:
                 raise DatabaseLookupError(
                     f"table {metadata.name} has no field {field}"
                 )
 
+        if not query:
+            logger.info("Query is empty, finding all entries!")
+            # The history already contains the record content, so there's
+            # no need to fetch each message again.
+            async for msg in main_table.history(limit=None):
+                logger.debug("Found message in channel: {}", msg)
+                entry = _Record.decode_message(msg.content, table)
+                entry.__disco_id__ = msg.id
+                records.append(entry)
+
+            return records
+
+        # Every field has to match, so this is the intersection of the
+        # record IDs found for each field. Index entries list their IDs in
+        # insertion order, so the first field's list is kept for ordering.
+        ordered_ids: list[int] | None = None
+        matched: set[int] | None = None
+        for field, (hashed_field, target_index) in self._as_hashed_many(
+            query
+        ).items():
             channel = self._find_channel(
-                metadata.index_channels[f"{name}_{field}"]
+                metadata.index_channels[self._index_channel_names[field]]
             )
-
-            hashed_field, target_index = self._as_hashed(value)
             entry_message = await self._lookup_message(
                 channel,
                 target_index,
@@ -757,11 +1485,11 @@ class TableCursor:
 
             if not serialized_content:
                 logger.info("Nothing was found.")
-                continue
+                return records
 
             if serialized_content.key == hashed_field:
-                logger.debug(f"Key matches hash! {serialized_content}")
-                sets_list.append(set(serialized_content.record_ids))
+                logger.debug("Key matches hash! {}", serialized_content)
+                record_ids = serialized_content.record_ids
             else:
                 # Hash collision!
                 def find_hash(message: str | None) -> bool:
@@ -781,7 +1509,7 @@ class TableCursor:
                 )
 
                 rec = _IndexableRecord.from_message(entry.content)
-                logger.debug(f"Found hash collision index entry: {rec}")  # noqa
+                logger.debug("Found hash collision index entry: {}", rec)  # noqa
                 if not rec:
                     # This shouldn't be possible, considering the
                     # search function explicitly disallows that.
@@ -789,31 +1517,37 @@ class TableCursor:
                         "search function found null entry somehow"
                     )
 
-                sets_list.append(set(rec.record_ids))
-
-        if not query:
-            logger.info("Query is empty, finding all entries!")
-            channel = self._find_channel(metadata.table_channel)
-            async for msg in channel.history(limit=None):
-                logger.debug(f"Found message in channel: {msg}")
-                sets_list.append({msg.id})
-
-        main_table = self._find_channel(metadata.table_channel)
-        if not isinstance(main_table, discord.TextChannel):
-            raise DatabaseCorruptionError(
-                f"expected {main_table!r} to be a TextChannel"
-            )
+                record_ids = rec.record_ids
 
-        logger.debug(f"Got IDs: {sets_list}")
-        records: list[Table] = []
+            if matched is None:
+                ordered_ids = record_ids
+                matched = set(record_ids)
+            else:
+                matched.intersection_update(record_ids)
+
+            if not matched:
+                logger.info("No records match every field.")
+                return records
+
+        assert ordered_ids is not None and matched is not None
+        found_ids: list[int] = [
+            record_id
+            for record_id in dict.fromkeys(ordered_ids)
+            if record_id in matched
+        ]
+        logger.debug("Got IDs: {}", found_ids)
+
+        # Each fetch is an independent round-trip, so we fire them all
+        # at once instead of awaiting them one by one. gather() keeps the
+        # order of the results.
+        messages: list[discord.Message] = await asyncio.gather(
+            *[main_table.fetch_message(record_id) for record_id in found_ids]
+        )
 
-        for record_ids in sets_list:
-            for record_id in record_ids:
-                message = await main_table.fetch_message(record_id)
-                record = _Record.model_validate_json(message.content)
-                entry = record.decode_content(table)
-                entry.__disco_id__ = message.id
-                records.append(entry)
+        for message in messages:
+            entry = _Record.decode_message(message.content, table)
+            entry.__disco_id__ = message.id
+            records.append(entry)
 
         return records
 
@@ -844,11 +1578,90 @@ class TableCursor:
             f"{table}_{key_name}"
         )
         logger.debug(f"Generated key channel: {index_channel}")
+        self._channels_by_id[index_channel.id] = index_channel
         last_message_snowflake = await self._resize_hash(
             index_channel, initial_size
         )
         return index_channel.name, index_channel.id, last_message_snowflake
 
+    @staticmethod
+    async def _search_metadata(
+        metadata_channel: discord.TextChannel,
+        name: str,
+    ) -> Metadata | None:
+        """
+        Find the metadata of a single table in the metadata channel.
+
+        Args:
+            metadata_channel: The database's metadata channel.
+            name: Name of the table.
+
+        Returns:
+            Metadata | None: The table's metadata, or `None` if the table
+                hasn't been created yet.
+        """
+        # Only one message in the channel belongs to this table, so skip
+        # validating the others. This is the exact form the name takes in
+        # `model_dump_json()`, which leaves non-ASCII characters as-is.
+        name_marker = '"name":' + json.dumps(name, ensure_ascii=False)
+        async for msg in metadata_channel.history(limit=None):
+            if name_marker not in msg.content:
+                continue
+
+            try:
+                parsed_meta = Metadata.model_validate_json(msg.content)
+            except ValidationError as e:
+                raise DatabaseCorruptionError("got invalid metadata") from e
+
+            if parsed_meta.name == name:
+                # The stored ID is filled in after the message is sent, and
+                # that edit might not have landed yet.
+                parsed_meta.message_id = msg.id
+                logger.debug(
+                    f"Found existing metadata for table {name}: {parsed_meta}"
+                )
+                return parsed_meta
+
+        return None
+
+    @staticmethod
+    async def load_metadata(
+        metadata_channel: discord.TextChannel,
+    ) -> dict[str, Metadata]:
+        """
+        Read the metadata of every table in the metadata channel.
+
+        This is meant for opening several tables at once, as it only
+        walks the channel's history one time.
+
+        Args:
+            metadata_channel: The database's metadata channel.
+
+        Returns:
+            dict[str, Metadata]: Dictionary of table names to their metadata.
+        """
+        stored: dict[str, Metadata] = {}
+        async for msg in metadata_channel.history(limit=None):
+            try:
+                parsed_meta = Metadata.model_validate_json(msg.content)
+            except ValidationError as e:
+                # Don't let one bad message stop every table from loading.
+                # create_table() searches again for tables that aren't in
+                # the result, and raises if their metadata is the bad one.
+                logger.opt(exception=e).warning(
+                    f"Skipping invalid metadata message {msg.id}"
+                )
+                continue
+
+            # See _search_metadata()
+            parsed_meta.message_id = msg.id
+            # History is newest first, so prefer the first one we find,
+            # like create_table() does.
+            stored.setdefault(parsed_meta.name, parsed_meta)
+
+        logger.debug(f"Loaded stored metadata for tables: {list(stored)}")
+        return stored
+
     @classmethod
     async def create_table(
         cls,
@@ -856,16 +1669,23 @@ class TableCursor:
         metadata_channel: discord.TextChannel,
         guild: discord.Guild,
         initial_size: int = 4,
+        *,
+        stored_metadata: dict[str, Metadata] | None = None,
     ) -> TableCursor:
         """
         Creates a new table and all index tables that go with it.
         This writes the table metadata.
 
-        If the table already exists, this method does (almost) nothing.
+        If the table already exists, this method does (almost) nothing,
+        unless fields with a default value were added to it. In that case,
+        the index is rebuilt to include them.
 
         Args:
             table: Table schema to create channels for.
             initial_hash_size: the size the index hash tables should start at.
+            stored_metadata: Result of `load_metadata()`, if it was already
+                called. If this is `None`, the metadata channel is searched
+                for this table.
 
         Returns:
             TableCursor: An object used to manage a table
@@ -874,33 +1694,50 @@ class TableCursor:
         logger.debug(f"create_table called with table: {table!r}")
         name = table.__disco_name__
         existing_metadata: Metadata | None = None
+        if stored_metadata is not None:
+            existing_metadata = stored_metadata.get(name)
+
+        if existing_metadata is None:
+            # Either the table is new, or its metadata message couldn't be
+            # read by load_metadata(). Searching again tells them apart.
+            existing_metadata = await cls._search_metadata(
+                metadata_channel,
+                name,
+            )
 
-        async for msg in metadata_channel.history(limit=None):
-            try:
-                parsed_meta = Metadata.model_validate_json(msg.content)
-            except ValidationError as e:
-                raise DatabaseCorruptionError("got invalid metadata") from e
-
-            if parsed_meta.name == name:
-                logger.debug(
-                    f"Found existing metadata for table {name}: {parsed_meta}"
+        added_keys: set[str] = set()
+        if existing_metadata:
+            stored_keys = set(existing_metadata.keys)
+            added_keys = table.__disco_keys__ - stored_keys
+            # Fields with a default can be added, the existing records
+            # just get the default.
+            if (stored_keys - table.__disco_keys__) or any(
+                table.model_fields[key].is_required() for key in added_keys
+            ):
+                logger.error(
+                    f"stored keys: {', '.join(existing_metadata.keys)} -- table keys: {', '.join(table.__disco_keys__)}"  # noqa
+                )
+                raise DatabaseCorruptionError(
+                    f"schema for table {name} changed"
                 )
-                existing_metadata = parsed_meta
-                break
 
-        if existing_metadata and (
-            set(existing_metadata.keys) != table.__disco_keys__
-        ):
-            logger.error(
-                f"stored keys: {', '.join(existing_metadata.keys)} -- table keys: {', '.join(table.__disco_keys__)}"  # noqa
+        if existing_metadata and added_keys:
+            logger.info(
+                f"New fields in table {name}: {', '.join(added_keys)}"
             )
-            raise DatabaseCorruptionError(f"schema for table {name} changed")
+            cursor = TableCursor(existing_metadata, metadata_channel, guild)
+            await cursor._reindex(table, existing_metadata.keys)
+            table.__disco_cursor__ = cursor
+            return cursor
 
-        matching: list[str] = []
-        for channel in guild.channels:
-            for key in table.__disco_keys__:
-                if channel.name == f"{name}_{key}":
-                    matching.append(key)
+        expected_channels: dict[str, str] = {
+            f"{name}_{key}": key for key in table.__disco_keys__
+        }
+        matching: list[str] = [
+            expected_channels[channel.name]
+            for channel in guild.channels
+            if channel.name in expected_channels
+        ]
 
         if existing_metadata and matching:
             if not len(matching) == len(table.__disco_keys__):
@@ -928,8 +1765,11 @@ class TableCursor:
             max_records=initial_size,
             time_table={},
             message_id=0,
+            hash_version=2,
         )
         self = TableCursor(metadata, metadata_channel, guild)
+        # The gateway event for the new channel might not have arrived yet.
+        self._channels_by_id[primary_table.id] = primary_table
         timestamp_snowflake: int | None = None
 
         index_channels: dict[str, int] = {}
@@ -950,16 +1790,32 @@ class TableCursor:
 
         assert timestamp_snowflake is not None
         metadata.time_table = {timestamp_snowflake: (0, initial_size)}
+        self._build_range_index()
         metadata.index_channels = index_channels
+        dumped_metadata = metadata.model_dump_json()
         message = await self.metadata_channel.send(
-            metadata.model_dump_json(), silent=True
+            dumped_metadata, silent=True
         )
 
         table.__disco_cursor__ = self
         # Since Discord generates the message ID, we have to do these
         # message editing shenanigans.
+        #
+        # The ID is the only thing that changed, so we can splice it into
+        # the existing dump instead of serializing everything again.
+        #
+        # Nothing needs to read the stored ID back (the cursor already has
+        # it in memory), so the table is usable without waiting on the edit.
         metadata.message_id = message.id
-        await message.edit(content=metadata.model_dump_json())
+        self._metadata_write = free_fly(
+            message.edit(
+                content=dumped_metadata.replace(
+                    '"message_id":0',
+                    f'"message_id":{message.id}',
+                    1,
+                )
+            )
+        )
         logger.debug(f"Generated table metadata: {metadata!r}")
         return self
 
@@ -978,35 +1834,22 @@ class TableCursor:
         main_table: discord.TextChannel = self._find_channel(
             metadata.table_channel
         )
-        msg = await main_table.fetch_message(record.__disco_id__)
-        current = _Record.model_validate_json(msg.content).decode_content(
-            record
-        )
-
-        for field, value in current.model_dump().items():
-            channel = self._find_channel(
-                metadata.index_channels[f"{current.__disco_name__}_{field}"]
-            )
-
-            index = self._to_index(self._hash(value))
-            index_message = await self._lookup_message(channel, index)
-            index_record = _IndexableRecord.from_message(index_message.content)
-
-            if not index_record:
-                raise DatabaseCorruptionError("got null record somehow")
-
-            if len(index_record.record_ids) == 1:
-                logger.info("We can nullify this entry.")
-                await index_message.edit(content="null")
-                self.metadata.current_records -= 1
-            else:
-                logger.info(
-                    "There are other entries with this value, only remove this ID."  # noqa
-                )
-                index_record.record_ids.remove(msg.id)
-                await index_message.edit(
-                    content=index_record.model_dump_json(),
+        async with self._writing():
+            msg = await main_table.fetch_message(record.__disco_id__)
+            current = _Record.decode_message(msg.content, record)
+
+            # Every field has its own index channel, so the entries can be
+            # removed concurrently.
+            coros: list[Coroutine] = []
+            for field, (_, index) in self._as_hashed_many(
+                current.model_dump()
+            ).items():
+                channel = self._find_channel(
+                    metadata.index_channels[self._index_channel_names[field]]
                 )
+                coros.append(self._remove_index_record(channel, index, msg.id))
 
-        record.__disco_id__ = -1
-        await msg.delete()
+            await asyncio.gather(*coros)
+            record.__disco_id__ = -1
+            await msg.delete()
+            await self._flush_metadata()
@@ -22,3 +22,11 @@ class Metadata(BaseModel):
     """Table of UNIX timestamp -> index range."""
     message_id: int
     """ID of the metadata message."""
+    hash_version: int = 1
+    """
+    Version of the hashing scheme used by the index channels.
+
+    Version 1 uses SHA-1 for strings, and version 2 uses BLAKE2b for strings
+    and the canonical JSON of containers. Tables created before this field
+    existed don't store it, so it defaults to 1.
+    """
@@ -1,4 +1,10 @@
+from __future__ import annotations
+
 import json
+import string
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING
 
 import discord
 from discord import app_commands
@@ -6,8 +12,33 @@ from discord.ext import commands
 from loguru import logger
 from pydantic import ValidationError
 
+from ..exceptions import DiscobaseError
 from ..ui import embed as em
 
+if TYPE_CHECKING:
+    from ..table import Table
+
+try:
+    # orjson parses a lot faster than the standard library. Its decode
+    # error is a subclass of json.JSONDecodeError, so either can be caught
+    # the same way.
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+_TABLE_NAME_TRANSLATION = str.maketrans(
+    "-" + string.ascii_uppercase, " " + string.ascii_lowercase
+)
+"""
+Turns a channel name back into a table name in one pass, like
+`name.replace("-", " ").lower()` for ASCII names.
+"""
+
+FIND_CACHE_SIZE = 100
+"""Maximum number of `/find` results that are kept cached."""
+FIND_CACHE_TTL = 30
+"""Number of seconds that a cached `/find` result stays valid."""
+
 
 class Utility(commands.Cog):
     """
@@ -17,6 +48,57 @@ class Utility(commands.Cog):
     def __init__(self, bot: commands.Bot) -> None:
         self.bot = bot
         self.db = self.bot.db
+        self._find_cache: OrderedDict[
+            tuple[str, str, str], tuple[float, int, list[Table]]
+        ] = OrderedDict()
+        """
+        LRU cache of `(table, column, value)` to the expiry time, the
+        table's `write_version` at lookup time, and the results of `/find`.
+
+        An entry is only used while the table's cursor still has the same
+        write version, so any write to the table (through this cog or
+        not) makes it stale.
+        """
+
+    async def _cached_find(
+        self,
+        table: type[Table],
+        column: str,
+        value: str,
+    ) -> list[Table]:
+        """
+        Find records with a single column, reusing recent results.
+
+        Args:
+            table: Table to search.
+            column: Name of the column to search.
+            value: Value to search for.
+
+        Returns:
+            list[Table]: The matching records.
+        """
+        cursor = table.__disco_cursor__
+        if cursor is None:
+            # Not connected, let find() raise the proper error.
+            return await table.find(**{column: value})
+
+        key = (table.__disco_name__, column, value)
+        now = time.monotonic()
+        # Read this before searching, so a write that finishes while the
+        # search is running leaves the entry stale.
+        version = cursor.write_version
+        cached = self._find_cache.get(key)
+        if cached and cached[0] > now and cached[1] == version:
+            self._find_cache.move_to_end(key)
+            return cached[2]
+
+        results = await table.find(**{column: value})
+        self._find_cache[key] = (now + FIND_CACHE_TTL, version, results)
+        self._find_cache.move_to_end(key)
+        if len(self._find_cache) > FIND_CACHE_SIZE:
+            self._find_cache.popitem(last=False)
+
+        return results
 
     @app_commands.command(description="Insert new data into a table.")
     @app_commands.describe(
@@ -34,24 +116,22 @@ class Utility(commands.Cog):
             content=f"Looking for `{table.name}`..."
         )
 
-        table_name = table.name.replace("-", " ").lower()
+        table_name = table.name.translate(_TABLE_NAME_TRANSLATION)
 
-        try:
-            table_obj = self.db.tables[table_name]  # Table object
-        except IndexError as e:
-            logger.error(e)
+        table_obj = self.db.tables.get(table_name)
+        if table_obj is None:
             await interaction.edit_original_response(
                 content=f"The table `{table_name}` does not exist."
             )
             return
 
         try:
-            await interaction.edit_original_response(
-                content=f"Table `{table_name}` found! Adding data to table..."
-            )
-            data_dict: dict = json.loads(data)
-        except TypeError as e:
+            data_dict = json_loads(data)
+        except json.JSONDecodeError as e:
             logger.error(e)
+            data_dict = None
+
+        if not isinstance(data_dict, dict):
             await interaction.edit_original_response(
                 content=f"The data you entered was not in json format.\nEntered data: {data}"
             )
@@ -67,12 +147,21 @@ class Utility(commands.Cog):
             )
             return
 
-        await new_entry.save()
-
+        # save() already runs in the background, so the reply can be sent
+        # while the record is being written.
+        task = new_entry.save()
         await interaction.edit_original_response(
             content=f"I have inserted `{data}` into `{table_name}` table."
         )
 
+        try:
+            await task
+        except (DiscobaseError, discord.HTTPException) as e:
+            logger.exception(e)
+            await interaction.edit_original_response(
+                content=f"Failed to insert `{data}` into `{table_name}` table."
+            )
+
     @app_commands.command(
         description="Finds a record with the specific column and value in the table."
     )
@@ -88,47 +177,43 @@ class Utility(commands.Cog):
         column: str,
         value: str,
     ) -> None:
-        table_info: list | None = None
-        results: list | None = None
-        column: str = column.lower()
-        results_found: int | None = None
-        results_str: str = ""
-
         logger.debug("Find slash cmd initialised.")
         await interaction.response.send_message(
             content=f"Searching for `{value}`..."
         )
 
-        if table.name in self.bot.db.tables:
-            table_info = self.bot.db.tables[table.name]
-
-            if column in table_info.__disco_keys__:
-                results = await table_info.find(**{column: value})
-                results_found = len(results)
-                if results_found > 0:
-                    for count, value in enumerate(results, start=1):
-                        results_str += f"**{count}**. {str(value)}\n"
-
-                    embed = em.EmbedFromContent(
-                        title=f"Search Result - {results_found} Record(s) Found",
-                        content=[],
-                        headers=None,
-                        style=em.EmbedStyle.DEFAULT,
-                    ).create()
-
-                    embed.description = results_str
-
-                    await interaction.edit_original_response(
-                        content="", embed=embed
-                    )
-                else:
-                    await interaction.edit_original_response(
-                        content="The record could not be found."
-                    )
-        else:
+        table_info = self.db.tables.get(table.name)
+        column_name = (
+            table_info.__disco_keys_map__.get(column.lower())
+            if table_info is not None
+            else None
+        )
+        if column_name is None:
             await interaction.edit_original_response(
                 content="Either the table doesn't exist or the column doesn't exist."
             )
+            return
+
+        results = await self._cached_find(table_info, column_name, value)
+        if not results:
+            await interaction.edit_original_response(
+                content="The record could not be found."
+            )
+            return
+
+        embed = em.EmbedFromContent(
+            title=f"Search Result - {len(results)} Record(s) Found",
+            content=[],
+            headers=None,
+            style=em.EmbedStyle.DEFAULT,
+        ).create()
+
+        embed.description = "\n".join(
+            f"**{count}**. {result}"
+            for count, result in enumerate(results, start=1)
+        )
+
+        await interaction.edit_original_response(content="", embed=embed)
 
     @app_commands.command(description="Modifies a record with a new value.")
     @app_commands.describe(
@@ -146,41 +231,44 @@ class Utility(commands.Cog):
         new_value: str,
     ) -> None:
         logger.debug("Update slash cmd initialized.")
-        table_info: list | None = None
-        if table.name in self.db.tables:
-            await interaction.response.send_message(
-                content=f"Table `{table.name}` found! Searching for record..."
-            )
-            table_info = self.db.tables[table.name]
-
-            try:
-                if column in table_info.__disco_keys__:
-                    column_name = [
-                        col
-                        for col in table_info.__disco_keys__
-                        if col.lower() == column.lower()
-                    ][0]
-                    found_table = (
-                        await table_info.find(**{column_name: current_value})
-                    )[0]
-                    setattr(found_table, column_name, new_value)
-                    found_table.update()
-                    await interaction.edit_original_response(
-                        content=f"Successfully updated the value of **{column}** in **{table.name}**."
-                    )
-                else:
-                    await interaction.edit_original_response(
-                        content="The column does not exist."
-                    )
-            except ValidationError:
-                await interaction.edit_original_response(
-                    content=f"`{new_value}` could not be converted to the field's data type, use `/schema` to "
-                    f"check the data type of the column before trying again."
-                )
-        else:
+        await interaction.response.send_message(
+            content=f"Searching for table `{table.name}`..."
+        )
+
+        table_info = self.db.tables.get(table.name)
+        if table_info is None:
             await interaction.edit_original_response(
                 content="There is no table with that name, try creating a table."
             )
+            return
+
+        column_name = table_info.__disco_keys_map__.get(column.lower())
+        if column_name is None:
+            await interaction.edit_original_response(
+                content="The column does not exist."
+            )
+            return
+
+        try:
+            found_table = (
+                await table_info.find(**{column_name: current_value})
+            )[0]
+            setattr(found_table, column_name, new_value)
+            task = found_table.update()
+            await interaction.edit_original_response(
+                content=f"Successfully updated the value of **{column}** in **{table.name}**."
+            )
+            await task
+        except (DiscobaseError, discord.HTTPException) as e:
+            logger.exception(e)
+            await interaction.edit_original_response(
+                content=f"Failed to update the value of **{column}** in **{table.name}**."
+            )
+        except ValidationError:
+            await interaction.edit_original_response(
+                content=f"`{new_value}` could not be converted to the field's data type, use `/schema` to "
+                f"check the data type of the column before trying again."
+            )
 
     @app_commands.command(description="Deletes a record from a table.")
     @app_commands.describe(
@@ -198,46 +286,45 @@ class Utility(commands.Cog):
             content=f"Searching for table `{table.name}`..."
         )
 
-        try:
-            table_obj = self.db.tables[table.name]
-            await interaction.edit_original_response(
-                content=f"Table `{table_obj.__disco_name__}` found! Searching for record..."
-            )
-        except IndexError as e:
-            logger.error(e)
+        table_obj = self.db.tables.get(table.name)
+        if table_obj is None:
             await interaction.edit_original_response(
                 content=f"The table `{table.name}` does not exist."
             )
             return
 
         try:
-            record_dict = json.loads(record)
-            table_record = await table_obj.find(**record_dict)
-            table_record = table_record[0]
-            if table_record is None:
-                raise ValueError
-            await interaction.edit_original_response(
-                content=f"Record `{record}` found! Deleting..."
-            )
-        except ValueError as e:
+            record_dict = json_loads(record)
+        except json.JSONDecodeError as e:
             logger.error(e)
+            record_dict = None
+
+        if not isinstance(record_dict, dict):
             await interaction.edit_original_response(
-                content=f"No record found for `{record}`."
+                content=f"The record you entered was not in json format.\nEntered record: {record}"
             )
             return
-        except TypeError as e:
-            logger.error(e)
+
+        table_records = await table_obj.find(**record_dict)
+        if not table_records:
             await interaction.edit_original_response(
-                content=f"The record you entered was not in json format.\nEntered record: {record}"
+                content=f"No record found for `{record}`."
             )
             return
 
-        await table_record.delete()
-
+        task = table_records[0].delete()
         await interaction.edit_original_response(
             content=f"Record `{record}` has been deleted from `{table.name}`!"
         )
 
+        try:
+            await task
+        except (DiscobaseError, discord.HTTPException) as e:
+            logger.exception(e)
+            await interaction.edit_original_response(
+                content=f"Failed to delete `{record}` from `{table.name}`."
+            )
+
     @app_commands.command(
         description="Resets the database, deleting all channels and unloading tables."
     )
@@ -247,6 +334,7 @@ class Utility(commands.Cog):
             content=f"Resetting the database, `{self.db.name}`..."
         )
         await self.db.clean()
+        self._find_cache.clear()
         await interaction.edit_original_response(
             content=f"Database `{self.db.name}` has been reset!"
         )
@@ -30,36 +30,23 @@ class Visualization(commands.Cog):
         )
         table_name = name.name.replace("-", " ").lower()
 
-        try:
-            table = self.db.tables[table_name]
-            await interaction.edit_original_response(
-                content=f"Table `{table_name}` found! Gathering data..."
-            )
-        except IndexError as e:
-            logger.error(e)
+        table = self.db.tables.get(table_name)
+        if table is None:
             await interaction.edit_original_response(
                 content=f"The table `{name.name}` does not exist."
             )
             return
 
-        table_columns = [
-            col for col in table.__disco_keys__
-        ]  # convert set to list to enable subscripting
-
-        data: dict[str:list] = {}
-        for col in table_columns:
-            data[col] = []
+        # convert set to list to enable subscripting
+        table_columns = list(table.__disco_keys__)
 
         table_values = await table.find()
         logger.info(table_values)
 
-        await interaction.edit_original_response(
-            content="Still gathering data..."
-        )
-
-        for game in table_values:
-            for col in table_columns:
-                data[col].append(getattr(game, col))
+        data: dict[str, list] = {
+            col: [getattr(record, col) for record in table_values]
+            for col in table_columns
+        }
 
         embed_from_content = em.EmbedFromContent(
             title=f"Table: {table.__disco_name__.title()}",
@@ -90,26 +77,15 @@ class Visualization(commands.Cog):
         await interaction.response.send_message(
             f"Searching for table `{table.name}`..."
         )
-        try:
-            col_table = self.db.tables[table.name]
-            await interaction.edit_original_response(
-                content=f"Table `{col_table.__disco_name__}` found! Gathering column data..."
-            )
-        except IndexError as e:
-            logger.error(e)
+        col_table = self.db.tables.get(table.name)
+        if col_table is None:
             await interaction.edit_original_response(
                 content=f"The table `{table.name}` does not exist."
             )
             return
 
-        try:
-            column = [
-                col
-                for col in col_table.__disco_keys__
-                if col.lower() == name.lower()
-            ][0]
-        except (IndexError, ValueError) as e:
-            logger.error(e)
+        column = col_table.__disco_keys_map__.get(name.lower())
+        if column is None:
             await interaction.edit_original_response(
                 content=f"The column `{name}` does not exist in the table `{col_table.__disco_name__}`."
             )
@@ -182,13 +158,12 @@ class Visualization(commands.Cog):
         await interaction.response.send_message(
             content=f"Getting schema for {table.name}..."
         )
-        table_info: list | None = None
         table_schema: dict | None = None
         schemas: list[dict] | None = None
         embed_gen: discord.Embed | None = None
 
-        if table.name in self.db.tables:
-            table_info = self.db.tables[table.name]
+        table_info = self.db.tables.get(table.name)
+        if table_info is not None:
             table_schema = table_info.model_json_schema()
             schemas = [
                 table_schema["properties"][disco_key]
@@ -24,6 +24,11 @@ class Database:
     """
     Top level class representing a Discord
     database bot controller.
+
+    A database should only have one writer at a time. Index entries are
+    cached after they're written, so records written by another `Database`
+    instance (or by editing the server by hand) while this one is connected
+    might not be seen by it.
     """
 
     def __init__(
@@ -211,12 +216,18 @@ class Database:
             self._not_connected()
 
         self._metadata_channel = await self._metadata_init()
+        # Read the metadata channel once for all tables, instead of
+        # having each table search it separately.
+        stored_metadata = await TableCursor.load_metadata(
+            self._metadata_channel
+        )
         tasks = [
             asyncio.ensure_future(
                 TableCursor.create_table(
                     table,
                     self._metadata_channel,
                     self.guild,
+                    stored_metadata=stored_metadata,
                 )
             )
             for table in self.tables.values()
@@ -237,13 +248,14 @@ class Database:
             raise self._on_ready_exc
 
     def _find_channel(self, cid: int) -> discord.TextChannel:
-        # TODO: Implement caching for this function.
         if not self.guild:
             self._not_connected()
 
-        index_channel = [
-            channel for channel in self.guild.channels if channel.id == cid
-        ][0]
+        index_channel = self.guild.get_channel(cid)
+        if not index_channel:
+            raise DatabaseCorruptionError(
+                f"could not find channel with id {cid}"
+            )
 
         if not isinstance(index_channel, discord.TextChannel):
             raise DatabaseCorruptionError(
@@ -455,5 +467,11 @@ class Database:
         for field in clas.model_fields:
             clas.__disco_keys__.add(field)
 
+        # The slash commands take column names from users, so they look
+        # them up case-insensitively.
+        clas.__disco_keys_map__ = {
+            key.lower(): key for key in clas.__disco_keys__
+        }
+
         self.tables[clas.__disco_name__] = clas
         return clas
@@ -1,8 +1,8 @@
 from __future__ import annotations
 
 import asyncio
-from typing import (TYPE_CHECKING, Any, ClassVar, Literal, Optional, Set,
-                    overload)
+from typing import (TYPE_CHECKING, Any, ClassVar, Dict, Literal, Optional,
+                    Set, overload)
 
 import discord
 from pydantic import BaseModel, ConfigDict
@@ -29,6 +29,8 @@ class Table(BaseModel):
     """Internal table cursor, set at initialization time."""
     __disco_keys__: ClassVar[Set[str]]
     """All keys of the table, this may not change once set by `table()`."""
+    __disco_keys_map__: ClassVar[Dict[str, str]]
+    """Lowercase version of each key, mapped to the key. Set by `table()`."""
     __disco_name__: ClassVar[str]
     """Internal name of the table. Set by the `table()` decorator."""
     __disco_id__: int = -1
@@ -43,6 +45,7 @@ class Table(BaseModel):
         cls.__disco_database__ = None
         cls.__disco_cursor__ = None
         cls.__disco_keys__ = set()
+        cls.__disco_keys_map__ = {}
         cls.__disco_name__ = "_notset"
 
     @classmethod
@@ -162,7 +165,8 @@ class Table(BaseModel):
             **kwargs: Values to search for. These should be keys in the schema.
 
         Returns:
-            list[Table]: The list of objects that match the values in `kwargs`.
+            list[Table]: The list of objects that match every value in
+                `kwargs`.
 
         Example:
             ```py
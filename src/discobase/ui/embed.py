@@ -27,6 +27,8 @@ class ArrowButtons(discord.ui.View):
         self.pages = len(self.content)
         self.on_ready()
 
+    # discord.py replaces each decorated callback on the instance with its
+    # button item, so `self.back` and `self.forward` are the buttons.
     @discord.ui.button(
         label="◀", style=discord.ButtonStyle.primary, custom_id="l_button"
     )
@@ -42,9 +44,7 @@ class ArrowButtons(discord.ui.View):
             button.disabled = True
 
         # set the right button to a variable
-        right_button = [x for x in self.children if x.custom_id == "r_button"][
-            0
-        ]
+        right_button = self.forward
 
         # check if we're not on the last page, if yes then enable right button
         if not self.position == self.pages - 1:
@@ -66,9 +66,7 @@ class ArrowButtons(discord.ui.View):
         self.position += 1
 
         # set a variable for left button
-        left_button = [x for x in self.children if x.custom_id == "l_button"][
-            0
-        ]
+        left_button = self.back
         # check if we're not on the first page, if yes then enable left button
         if not self.position == 0:
             left_button.disabled = False
@@ -84,12 +82,8 @@ class ArrowButtons(discord.ui.View):
 
     def on_ready(self) -> None:
         """Checks the number of pages to decide which buttons to have enabled/disabled"""
-        left_button = [x for x in self.children if x.custom_id == "l_button"][
-            0
-        ]
-        right_button = [x for x in self.children if x.custom_id == "r_button"][
-            0
-        ]
+        left_button = self.back
+        right_button = self.forward
 
         # if we only have one page, disable both buttons
         if self.pages == 1:
@@ -0,0 +1,640 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+from base64 import urlsafe_b64encode
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import Any, AsyncIterator
+
+import discord
+import pytest
+from discord.utils import time_snowflake
+
+from discobase import Table
+from discobase._cursor import TableCursor, _IndexableRecord, _Record
+from discobase._metadata import Metadata
+from discobase.exceptions import DatabaseCorruptionError, DatabaseStorageError
+
+
+def make_cursor(
+    *,
+    max_records: int = 4,
+    hash_version: int = 2,
+) -> TableCursor:
+    metadata = Metadata(
+        name="test",
+        keys=(),
+        table_channel=0,
+        index_channels={},
+        current_records=0,
+        max_records=max_records,
+        time_table={},
+        message_id=0,
+        hash_version=hash_version,
+    )
+    return TableCursor(
+        metadata,
+        None,  # type: ignore
+        SimpleNamespace(channels=[]),  # type: ignore
+    )
+
+
+@pytest.mark.parametrize(
+    "first,second",
+    [
+        ({"a": 1, "b": [1, 2]}, {"b": [1, 2], "a": 1}),
+        ([1, 2], (1, 2)),
+        ({"b", "a", "c"}, {"c", "a", "b"}),
+        (frozenset({1, 2, 3}), frozenset({3, 2, 1})),
+        (b"abc", b"abc"),
+        (bytearray(b"abc"), b"abc"),
+        ({1: "a", "b": 2}, {"b": 2, 1: "a"}),
+        ({b"key": 1, 2: 3}, {2: 3, b"key": 1}),
+        ({"nested": {"x", "y"}}, {"nested": {"y", "x"}}),
+    ],
+)
+def test_hash_v2_containers(first, second):
+    cursor = make_cursor()
+    assert cursor._hash(first) == cursor._hash(second)
+
+
+def test_hash_v2_distinguishes_values():
+    cursor = make_cursor()
+    assert cursor._hash([1, 2]) != cursor._hash([2, 1])
+    assert cursor._hash({"a", "b"}) != cursor._hash({"a", "c"})
+    assert cursor._hash(b"abc") != cursor._hash(b"abd")
+    assert cursor._hash({1: "a", "b": 2}) != cursor._hash({1: "b", "b": 2})
+
+
+def test_hash_unhashable():
+    cursor = make_cursor()
+    with pytest.raises(DatabaseStorageError):
+        cursor._hash([object()])
+
+
+class FakeMessage:
+    # Like discord.Message, each object is a snapshot: editing or fetching
+    # returns a new object, and older copies keep their content.
+    def __init__(
+        self,
+        channel: FakeChannel,
+        content: str,
+        *,
+        message_id: int | None = None,
+        created_at: datetime | None = None,
+    ) -> None:
+        self.channel = channel
+        self.content = content
+        self.created_at = created_at or channel.guild.now()
+        self.id = message_id or time_snowflake(self.created_at)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, FakeMessage) and other.id == self.id
+
+    def __hash__(self) -> int:
+        return self.id
+
+    def copy(self) -> FakeMessage:
+        return FakeMessage(
+            self.channel,
+            self.content,
+            message_id=self.id,
+            created_at=self.created_at,
+        )
+
+    async def fetch(self) -> FakeMessage:
+        return await self.channel.fetch_message(self.id)
+
+    async def edit(self, *, content: str) -> FakeMessage:
+        stored = self.channel.stored(self.id)
+        stored.content = content
+        return stored.copy()
+
+    async def delete(self) -> None:
+        self.channel.messages.remove(self.channel.stored(self.id))
+
+
+class FakeChannel(discord.TextChannel):
+    # Only what TableCursor uses, kept in memory
+    def __init__(self, guild: FakeGuild, name: str, channel_id: int) -> None:
+        self.guild = guild  # type: ignore
+        self.name = name
+        self.id = channel_id
+        self.messages: list[FakeMessage] = []
+
+    def __repr__(self) -> str:
+        return f"<FakeChannel id={self.id} name={self.name!r}>"
+
+    def __hash__(self) -> int:
+        return self.id
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, FakeChannel) and other.id == self.id
+
+    async def delete(self) -> None:
+        self.guild.channels.remove(self)
+
+    def stored(self, mid: int) -> FakeMessage:
+        for message in self.messages:
+            if message.id == mid:
+                return message
+
+        raise LookupError(mid)
+
+    async def send(self, content: str, **_: Any) -> FakeMessage:
+        message = FakeMessage(self, content)
+        self.messages.append(message)
+        return message.copy()
+
+    async def fetch_message(self, mid: int) -> FakeMessage:
+        return self.stored(mid).copy()
+
+    async def history(
+        self,
+        *,
+        limit: int | None = 100,
+        before: datetime | None = None,
+        oldest_first: bool | None = None,
+    ) -> AsyncIterator[FakeMessage]:
+        messages = [
+            message
+            for message in self.messages
+            if before is None or message.created_at < before
+        ]
+        if not oldest_first:
+            messages.reverse()
+
+        for message in messages[:limit]:
+            yield message.copy()
+
+
+class FakeGuild:
+    def __init__(self) -> None:
+        self.channels: list[FakeChannel] = []
+        self._clock = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    def now(self) -> datetime:
+        # Far enough apart that a resize never lands inside the previous
+        # range's extra 5 seconds
+        self._clock += timedelta(seconds=10)
+        return self._clock
+
+    def get_channel(self, channel_id: int) -> FakeChannel | None:
+        for channel in self.channels:
+            if channel.id == channel_id:
+                return channel
+
+        return None
+
+    async def create_text_channel(self, name: str, **_: Any) -> FakeChannel:
+        channel = FakeChannel(self, name, len(self.channels) + 1)
+        self.channels.append(channel)
+        return channel
+
+
+class User(Table):
+    name: str
+    password: str
+    age: int
+
+
+User.__disco_name__ = "user"
+User.__disco_keys__.update(User.model_fields)
+
+
+def test_indexable_record_dump():
+    records = [
+        _IndexableRecord(key=1, record_ids=[]),
+        _IndexableRecord(key=-12345, record_ids=[1, 2, 3]),
+        _IndexableRecord(
+            key=2**63,
+            record_ids=[4],
+            next_value=_IndexableRecord(
+                key=5,
+                record_ids=[6, 7],
+                next_value=_IndexableRecord(key=8, record_ids=[9]),
+            ),
+        ),
+    ]
+    for record in records:
+        assert record.dump() == record.model_dump_json()
+
+
+def test_record_decoding():
+    user = User(name="Peter", password="foobar", age=30)
+    legacy = _Record(
+        content=urlsafe_b64encode(user.model_dump_json().encode()).decode()
+    )
+    current = _Record.from_data(user)
+
+    for record in (legacy, current):
+        message = record.model_dump_json()
+        assert _Record.model_validate_json(message).decode_content(
+            User
+        ) == user
+        assert _Record.decode_message(message, User) == user
+
+
+@pytest.mark.parametrize(
+    "message",
+    ["null", "[]", '{"content": 1}', '{"other": "{}"}', "not json"],
+)
+def test_record_decoding_corrupt(message: str):
+    with pytest.raises(DatabaseCorruptionError):
+        _Record.decode_message(message, User)
+
+
+def test_hash_versions():
+    v1 = make_cursor(hash_version=1)
+    v2 = make_cursor(hash_version=2)
+
+    for value in ("", "hello", "ünïcode"):
+        encoded = value.encode("utf-8")
+        assert v1._hash(value) == int(hashlib.sha1(encoded).hexdigest(), 16)
+        assert v2._hash(value) == int.from_bytes(
+            hashlib.blake2b(encoded, digest_size=8).digest(),
+            "big",
+        )
+        # Cached hashes have to match fresh ones
+        assert v1._hash(value) == make_cursor(hash_version=1)._hash(value)
+        assert v2._hash(value) == make_cursor(hash_version=2)._hash(value)
+
+    for value in (0, 1, -1, 2**40):
+        assert v1._hash(value) == v2._hash(value) == value
+
+    # Dictionaries hash the same way on both versions
+    assert v1._hash({"a": [1, 2]}) == v2._hash({"a": [1, 2]})
+    assert v1._hash(["a", 1]) == v1._hash(("a", 1))
+    assert v2._hash(["a", 1]) == v2._hash(("a", 1))
+
+
+@pytest.mark.parametrize(
+    "time_table",
+    [
+        # Grown purely by doubling
+        {100: (0, 4), 200: (4, 8), 300: (8, 16), 400: (16, 32)},
+        # Odd initial size
+        {100: (0, 3), 200: (3, 6), 300: (6, 12)},
+        # Irregular growth and a gap
+        {100: (0, 5), 200: (5, 7), 300: (9, 20)},
+        {100: (0, 1)},
+    ],
+)
+def test_find_range(time_table: dict[int, tuple[int, int]]):
+    cursor = make_cursor()
+    cursor.metadata.time_table = time_table
+    cursor._build_range_index()
+
+    for index in range(max(end for _, end in time_table.values()) + 5):
+        expected = None
+        for timestamp, (start, end) in time_table.items():
+            if start <= index < end:
+                expected = (start, end, timestamp)
+
+        assert cursor._find_range(index) == expected
+
+
+@pytest.mark.parametrize("max_records", [1, 2, 4, 3, 6, 1024, 1000])
+def test_to_index(max_records: int):
+    cursor = make_cursor(max_records=max_records)
+    assert (cursor._index_mask is not None) == (
+        max_records & (max_records - 1) == 0
+    )
+    for value in (0, 1, 7, -1, -12345, 2**31 - 1, 2**31, 2**63 + 17):
+        index = cursor._to_index(value)
+        assert index == (value & 0x7FFFFFFF) % max_records
+        assert 0 <= index < max_records
+
+
+@pytest.mark.asyncio
+async def test_find_records_matches_every_field():
+    guild = FakeGuild()
+    metadata_channel = await guild.create_text_channel("_dbmetadata")
+    cursor = await TableCursor.create_table(
+        User,
+        metadata_channel,  # type: ignore
+        guild,  # type: ignore
+    )
+    users = [
+        User(name=f"user{i}", password="pw" if i % 2 else "other", age=i % 3)
+        for i in range(12)
+    ]
+    for user in users:
+        user.__disco_id__ = (await cursor.add_record(user)).id
+
+    def names(records: list[Table]) -> list[str]:
+        return [record.name for record in records]  # type: ignore
+
+    # Results come back in insertion order
+    expected = [
+        user.name for user in users if user.password == "pw" and user.age == 1
+    ]
+    found = await cursor.find_records(User, {"password": "pw", "age": 1})
+    assert names(found) == expected
+    assert names(await cursor.find_records(User, {"password": "pw"})) == [
+        user.name for user in users if user.password == "pw"
+    ]
+    assert await cursor.find_records(
+        User,
+        {"name": "user0", "password": "pw"},
+    ) == []
+    assert await cursor.find_records(User, {"name": "nobody"}) == []
+    assert len(await cursor.find_records(User, {})) == len(users)
+
+
+@pytest.mark.asyncio
+async def test_load_metadata_skips_invalid_messages():
+    guild = FakeGuild()
+    metadata_channel = await guild.create_text_channel("_dbmetadata")
+    cursor = await TableCursor.create_table(
+        User,
+        metadata_channel,  # type: ignore
+        guild,  # type: ignore
+    )
+    await metadata_channel.send("this is not metadata")
+
+    stored = await TableCursor.load_metadata(
+        metadata_channel,  # type: ignore
+    )
+    assert list(stored) == ["user"]
+    assert stored["user"] == cursor.metadata
+
+
+async def make_table() -> TableCursor:
+    guild = FakeGuild()
+    metadata_channel = await guild.create_text_channel("_dbmetadata")
+    return await TableCursor.create_table(
+        User,
+        metadata_channel,  # type: ignore
+        guild,  # type: ignore
+    )
+
+
+def index_entries(cursor: TableCursor, field: str) -> dict[int, list[int]]:
+    channel = cursor._find_channel(
+        cursor.metadata.index_channels[f"user_{field}"]
+    )
+    assert len(channel.messages) == cursor.metadata.max_records  # type: ignore
+    entries: dict[int, list[int]] = {}
+    for message in channel.messages:  # type: ignore
+        record = _IndexableRecord.from_message(message.content)
+        if record:
+            assert record.next_value is None
+            assert record.key not in entries
+            entries[record.key] = record.record_ids
+
+    return entries
+
+
+async def assert_caches_coherent(cursor: TableCursor) -> None:
+    for mid, known in cursor._known_messages.items():
+        assert known.content == known.channel.stored(mid).content  # type: ignore # noqa
+
+    for (cid, index), message in list(cursor._message_cache.items()):
+        channel = cursor._find_channel(cid)
+        found = await cursor._find_index_message(channel, index)
+        assert found.id == message.id
+
+
+@pytest.mark.asyncio
+async def test_update_record():
+    cursor = await make_table()
+    users = [
+        User(name="peter", password="pw", age=30),
+        User(name="jack", password="pw", age=40),
+    ]
+    for user in users:
+        user.__disco_id__ = (await cursor.add_record(user)).id
+
+    peter, jack = users
+    assert cursor.write_version == 2
+    before = {
+        field: index_entries(cursor, field) for field in User.model_fields
+    }
+
+    # Nothing changed, so the index is left alone
+    message = await cursor.update_record(peter)
+    assert message.id == peter.__disco_id__
+    assert before == {
+        field: index_entries(cursor, field) for field in User.model_fields
+    }
+
+    version = cursor.write_version
+    peter.name = "pete"
+    peter.password = "hunter2"
+    await cursor.update_record(peter)
+    assert cursor.write_version == version + 1
+
+    assert index_entries(cursor, "name") == {
+        cursor._hash("pete"): [peter.__disco_id__],
+        cursor._hash("jack"): [jack.__disco_id__],
+    }
+    assert index_entries(cursor, "password") == {
+        cursor._hash("hunter2"): [peter.__disco_id__],
+        cursor._hash("pw"): [jack.__disco_id__],
+    }
+    assert index_entries(cursor, "age") == before["age"]
+    assert cursor.metadata.current_records == 6
+
+    found = await cursor.find_records(User, {"name": "pete"})
+    assert [user.model_dump() for user in found] == [peter.model_dump()]
+    assert await cursor.find_records(User, {"name": "peter"}) == []
+    assert [
+        user.name  # type: ignore
+        for user in await cursor.find_records(User, {"password": "pw"})
+    ] == ["jack"]
+    await assert_caches_coherent(cursor)
+
+
+@pytest.mark.asyncio
+async def test_delete_record():
+    cursor = await make_table()
+    users = [
+        User(name="peter", password="pw", age=30),
+        User(name="jack", password="pw", age=40),
+    ]
+    for user in users:
+        user.__disco_id__ = (await cursor.add_record(user)).id
+
+    peter, jack = users
+    peter_id = peter.__disco_id__
+    await cursor.delete_record(peter)
+    assert peter.__disco_id__ == -1
+    assert cursor.write_version == 3
+
+    main_table = cursor._find_channel(cursor.metadata.table_channel)
+    assert [
+        message.id for message in main_table.messages  # type: ignore
+    ] == [jack.__disco_id__]
+    assert index_entries(cursor, "name") == {
+        cursor._hash("jack"): [jack.__disco_id__],
+    }
+    assert index_entries(cursor, "password") == {
+        cursor._hash("pw"): [jack.__disco_id__],
+    }
+    assert index_entries(cursor, "age") == {
+        cursor._hash(40): [jack.__disco_id__],
+    }
+    assert cursor.metadata.current_records == 3
+    assert peter_id not in [
+        user.__disco_id__
+        for user in await cursor.find_records(User, {"password": "pw"})
+    ]
+    assert await cursor.find_records(User, {"name": "peter"}) == []
+    await assert_caches_coherent(cursor)
+
+
+@pytest.mark.asyncio
+async def test_resize_keeps_records():
+    cursor = await make_table()
+    users = [
+        User(name=f"user{i}", password=f"pw{i % 2}", age=i % 3)
+        for i in range(20)
+    ]
+    for user in users:
+        user.__disco_id__ = (await cursor.add_record(user)).id
+
+    # Big enough that the resize edits were sent in more than one batch
+    assert cursor.metadata.max_records >= 32
+    assert cursor.write_version == len(users)
+    assert index_entries(cursor, "name") == {
+        cursor._hash(user.name): [user.__disco_id__] for user in users
+    }
+    assert index_entries(cursor, "password") == {
+        cursor._hash(f"pw{n}"): [
+            user.__disco_id__ for user in users if user.password == f"pw{n}"
+        ]
+        for n in range(2)
+    }
+
+    for user in users:
+        found = await cursor.find_records(User, {"name": user.name})
+        assert [record.model_dump() for record in found] == [user.model_dump()]
+
+    await assert_caches_coherent(cursor)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_adds():
+    cursor = await make_table()
+    await cursor._reserve_records(6)
+    assert cursor.metadata.max_records == 8
+    assert cursor.metadata.current_records == 0
+    assert len(cursor.metadata.time_table) == 2
+
+    users = [User(name=f"user{i}", password="pw", age=i) for i in range(8)]
+    messages = await asyncio.gather(*map(cursor.add_record, users))
+    for user, message in zip(users, messages):
+        user.__disco_id__ = message.id
+
+    assert cursor.write_version == len(users)
+    assert sorted(index_entries(cursor, "password")[cursor._hash("pw")]) == (
+        sorted(user.__disco_id__ for user in users)
+    )
+    assert index_entries(cursor, "age") == {
+        cursor._hash(user.age): [user.__disco_id__] for user in users
+    }
+    assert len(await cursor.find_records(User, {"password": "pw"})) == len(
+        users
+    )
+    await assert_caches_coherent(cursor)
+
+
+@pytest.mark.asyncio
+async def test_write_refetches_free_slots():
+    cursor = await make_table()
+    channel = cursor._find_channel(cursor.metadata.index_channels["user_name"])
+    index = cursor._to_index(cursor._hash("alice"))
+    slot = await cursor._lookup_message(channel, index)
+    assert slot.content == "null"
+
+    # Someone else writes to the slot after this cursor has seen it
+    other = _IndexableRecord(key=1, record_ids=[123]).dump()
+    channel.stored(slot.id).content = other  # type: ignore
+
+    alice = User(name="alice", password="pw", age=1)
+    alice.__disco_id__ = (await cursor.add_record(alice)).id
+    assert channel.stored(slot.id).content == other  # type: ignore
+    assert index_entries(cursor, "name") == {
+        1: [123],
+        cursor._hash("alice"): [alice.__disco_id__],
+    }
+    await assert_caches_coherent(cursor)
+
+
+@pytest.mark.asyncio
+async def test_create_table_adds_defaulted_fields():
+    guild = FakeGuild()
+    metadata_channel = await guild.create_text_channel("_dbmetadata")
+    cursor = await TableCursor.create_table(
+        User,
+        metadata_channel,  # type: ignore
+        guild,  # type: ignore
+    )
+    users = [
+        User(name=f"user{i}", password="pw", age=i % 2) for i in range(6)
+    ]
+    for user in users:
+        user.__disco_id__ = (await cursor.add_record(user)).id
+
+    class NewUser(Table):
+        name: str
+        password: str
+        age: int
+        email: str = ""
+
+    NewUser.__disco_name__ = "user"
+    NewUser.__disco_keys__.update(NewUser.model_fields)
+
+    stored = await TableCursor.load_metadata(
+        metadata_channel,  # type: ignore
+    )
+    cursor = await TableCursor.create_table(
+        NewUser,
+        metadata_channel,  # type: ignore
+        guild,  # type: ignore
+        stored_metadata=stored,
+    )
+    assert set(cursor.metadata.keys) == NewUser.__disco_keys__
+    assert sorted(channel.name for channel in guild.channels) == sorted(
+        ["_dbmetadata", "user", "user_name", "user_password", "user_age"]
+        + ["user_email"]
+    )
+    assert index_entries(cursor, "email") == {
+        cursor._hash(""): [user.__disco_id__ for user in users]
+    }
+    assert index_entries(cursor, "name") == {
+        cursor._hash(user.name): [user.__disco_id__] for user in users
+    }
+    assert len(await cursor.find_records(NewUser, {"email": ""})) == 6
+
+    # The rebuilt metadata was stored, so loading it again is a no-op
+    stored = await TableCursor.load_metadata(
+        metadata_channel,  # type: ignore
+    )
+    assert stored["user"] == cursor.metadata
+    same = await TableCursor.create_table(
+        NewUser,
+        metadata_channel,  # type: ignore
+        guild,  # type: ignore
+        stored_metadata=stored,
+    )
+    assert same.metadata == cursor.metadata
+
+    # Records can't be given a value for a required field
+    class RequiredUser(Table):
+        name: str
+        password: str
+        age: int
+        email: str
+        phone: str
+
+    RequiredUser.__disco_name__ = "user"
+    RequiredUser.__disco_keys__.update(RequiredUser.model_fields)
+    with pytest.raises(DatabaseCorruptionError):
+        await TableCursor.create_table(
+            RequiredUser,
+            metadata_channel,  # type: ignore
+            guild,  # type: ignore
+        )